@@ -1,19 +1,109 @@
 import random
+import sys
+import time
+from array import array
+from multiprocessing import Pool
 
+BLOCK_SIZE = 10_000 # tickets per seeded block
 
-def get_numbers_ticket(min, max, quantity):
+
+def check_ticket_args(min, max, quantity):
     if min < 1 or max > 1000: # check range
-        return print('Numbers should be between 1 and 1000')
-    
+        raise ValueError('Numbers should be between 1 and 1000')
+
     if quantity > (max - min + 1): # check quantity
-        return print("Error! Quantity is too large for the given range.")
-    
+        raise ValueError("Error! Quantity is too large for the given range.")
+
+
+def get_numbers_ticket(min, max, quantity):
+    try:
+        check_ticket_args(min, max, quantity)
+    except ValueError as error:
+        return print(error)
+
     win_numbers = random.sample(range(min, max + 1), quantity) # get random unique numbers
     return sorted(win_numbers)
 
 
-print(get_numbers_ticket(1, 36, 5))
-print(get_numbers_ticket(0, 10, 2))
-print(get_numbers_ticket(1, 1001, 2))
-print(get_numbers_ticket(1, 10, 11))
-print(get_numbers_ticket(1, 10, 10))
\ No newline at end of file
+def draw_numbers(rng, min, max, count):
+    # about count uniform numbers from min..max made from random bytes in bulk;
+    # bytes that would make some numbers more likely are dropped
+    span = max - min + 1
+    if max < 256:
+        limit = 256 - 256 % span
+        table = bytes(min + value % span if value < limit else 0 for value in range(256))
+        return rng.randbytes(count).translate(table, bytes(range(limit, 256)))
+    limit = 65536 - 65536 % span
+    values = array('H', rng.randbytes(2 * count))
+    if sys.byteorder == 'big': # same numbers on every platform
+        values.byteswap()
+    return [min + value % span for value in values if value < limit]
+
+
+def ticket_block(task):
+    # tickets of one block; every block has its own generator seeded by (seed, block),
+    # so the result does not depend on which process makes the block
+    min, max, quantity, seed, block, size = task
+    rng = random.Random(f"{seed}/{block}")
+    draws = draw_numbers(rng, min, max, size * quantity)
+    position = 0
+    tickets = array('H')
+    for _ in range(size):
+        numbers = set(draws[position:position + quantity])
+        position += quantity
+        while len(numbers) < quantity: # a repeated number, draw more until all are unique
+            if position >= len(draws):
+                draws = draw_numbers(rng, min, max, size * quantity)
+                position = 0
+            numbers.add(draws[position])
+            position += 1
+        tickets.extend(sorted(numbers))
+    return tickets
+
+
+def generate_tickets(min, max, quantity, count, seed=None, jobs=None):
+    # count tickets as a 2D memoryview (count x quantity) over one packed array('H');
+    # the same seed gives the same tickets for any jobs
+    check_ticket_args(min, max, quantity)
+    if quantity < 1: # at least one number in a ticket
+        raise ValueError("Error! Quantity should be positive.")
+    if count < 1:
+        raise ValueError("Error! Count should be positive.")
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    tasks = [(min, max, quantity, seed, block, BLOCK_SIZE if count - start > BLOCK_SIZE else count - start)
+             for block, start in enumerate(range(0, count, BLOCK_SIZE))]
+    tickets = array('H')
+    if jobs and jobs > 1 and len(tasks) > 1:
+        with Pool(jobs) as pool:
+            for block in pool.imap(ticket_block, tasks):
+                tickets.extend(block)
+    else:
+        for task in tasks:
+            tickets.extend(ticket_block(task))
+    return memoryview(tickets).cast('B').cast('H', [count, quantity])
+
+
+def benchmark(count=200_000):
+    # get_numbers_ticket in a loop against one generate_tickets call
+    start = time.perf_counter()
+    for _ in range(count):
+        random.sample(range(1, 50), 6).sort()
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    generate_tickets(1, 49, 6, count, seed=1)
+    batch = time.perf_counter() - start
+    print(f"{count} tickets: one by one {count / single:,.0f}/s, generate_tickets {count / batch:,.0f}/s")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        print(get_numbers_ticket(1, 36, 5))
+        print(get_numbers_ticket(0, 10, 2))
+        print(get_numbers_ticket(1, 1001, 2))
+        print(get_numbers_ticket(1, 10, 11))
+        print(get_numbers_ticket(1, 10, 10))
+        print(generate_tickets(1, 36, 5, 3, seed=42).tolist())
@@ -1,24 +1,96 @@
 import re
+import sys
+import time
+from itertools import chain
+from multiprocessing import Pool
+
+NON_DIGITS = re.compile(r'\D+')
+# Characters that usually separate digits of a phone number, removed with one translate call
+SEPARATORS = str.maketrans('', '', ' \t\n\r()-./+')
+CHUNK_SIZE = 100_000  # numbers per task in the process pool
+
+
+def digits_only(text):
+    # Fast path: after removing the usual separators only digits are left
+    digits = text.translate(SEPARATORS)
+    if digits.isdecimal():
+        return digits
+    return NON_DIGITS.sub('', text)
 
 
 def normalize_phone(phone_number):
     # Remove unnecessary spaces and surrounding characters
-    phone_number = phone_number.strip() 
+    phone_number = phone_number.strip()
 
     # Process the phone number depending on its beginning
-    if re.match(r'^\+', phone_number):
+    if phone_number.startswith('+'):
          # If the number already starts with '+', just remove all non-digit characters except the '+'.
-        new_format_phone = '+' + re.sub(r'\D+', '', phone_number[1:])
-    elif re.match(r'^38', phone_number):
+        new_format_phone = '+' + digits_only(phone_number[1:])
+    elif phone_number.startswith('38'):
         # If the number starts with '38', remove all non-digit characters and add a '+'
-        new_format_phone = '+' + re.sub(r'\D+', '', phone_number)
+        new_format_phone = '+' + digits_only(phone_number)
     else:
         # For all other numbers, add '+38' and remove non-digit characters
-        new_format_phone = '+38' + re.sub(r'\D+', '', phone_number)
+        new_format_phone = '+38' + digits_only(phone_number)
 
 
     return new_format_phone
-         
+
+
+def is_valid_phone(phone):
+    # phone is a result of normalize_phone, so it is '+' and digits only.
+    # Ukrainian numbers are +380 and 9 digits, the others must fit E.164 (8-15 digits, no leading 0)
+    if not phone.isascii():
+        return False
+    if phone.startswith('+38'):
+        return len(phone) == 13 and phone.startswith('+380')
+    return 9 <= len(phone) <= 16 and phone[1:2] != '0'
+
+
+def normalize_chunk(phone_numbers):
+    # None instead of a number that is not valid after normalization
+    normalized = []
+    for phone_number in phone_numbers:
+        phone = normalize_phone(phone_number)
+        normalized.append(phone if is_valid_phone(phone) else None)
+    return normalized
+
+
+def normalize_phones(phone_numbers, jobs=None):
+    # Batch version of normalize_phone. Returns the normalized numbers (None for invalid ones)
+    # and a list of (index, raw number) for the invalid ones. jobs > 1 splits big inputs
+    # between processes, the order of the results stays the same
+    phone_numbers = list(phone_numbers)
+    if jobs and jobs > 1 and len(phone_numbers) > CHUNK_SIZE:
+        chunks = [phone_numbers[start:start + CHUNK_SIZE] for start in range(0, len(phone_numbers), CHUNK_SIZE)]
+        with Pool(jobs) as pool:
+            normalized = list(chain.from_iterable(pool.map(normalize_chunk, chunks)))
+    else:
+        normalized = normalize_chunk(phone_numbers)
+    invalid = [(index, phone_numbers[index]) for index, phone in enumerate(normalized) if phone is None]
+    return normalized, invalid
+
+
+def benchmark(count=1_000_000):
+    # Compare the old one-call path (module-level regex calls per number) with the batch API
+    numbers = [raw_numbers[index % len(raw_numbers)] for index in range(count)]
+
+    def old_normalize_phone(phone_number):
+        phone_number = phone_number.strip()
+        if re.match(r'^\+', phone_number):
+            return '+' + re.sub(r'\D+', '', phone_number[1:])
+        elif re.match(r'^38', phone_number):
+            return '+' + re.sub(r'\D+', '', phone_number)
+        return '+38' + re.sub(r'\D+', '', phone_number)
+
+    start = time.perf_counter()
+    [old_normalize_phone(number) for number in numbers]
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    normalize_phones(numbers)
+    batch = time.perf_counter() - start
+    print(f"{count} numbers: normalize_phone one by one {single:.2f}s, normalize_phones {batch:.2f}s "
+          f"({single / batch:.1f}x)")
 
 
 raw_numbers = [
@@ -33,5 +105,10 @@ raw_numbers = [
     "38050 111 22 11   ",
 ]
 
-sanitized_numbers = [normalize_phone(num) for num in raw_numbers]
-print(sanitized_numbers)
\ No newline at end of file
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        sanitized_numbers = [normalize_phone(num) for num in raw_numbers]
+        print(sanitized_numbers)
+        print(normalize_phones(raw_numbers + ["12", "+1 (202) 555-0143"]))
@@ -1,22 +1,32 @@
-from datetime import datetime, timedelta
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
 
 
-def get_upcoming_birthdays(users):
+def birthday_in_year(birthday, year):
+    # Feb 29 birthdays are celebrated on Feb 28 in non-leap years
+    try:
+        return birthday.replace(year=year)
+    except ValueError:
+        return birthday.replace(year=year, day=28)
+
+
+def get_upcoming_birthdays(users, today=None):
     # Get the current date
-    current_date = datetime.today().date()
+    current_date = today or datetime.today().date()
 
     upcoming_birthdays = []
 
     for user in users:
         # Convert the user's birthday from string to a date object
         user_birthday = datetime.strptime(user["birthday"], "%Y.%m.%d").date()
-        
+
         # Create a date for the upcoming birthday in the current year
-        upcoming_birthday = user_birthday.replace(year=current_date.year)
-        
+        upcoming_birthday = birthday_in_year(user_birthday, current_date.year)
+
         # If the birthday has already passed this year, adjust to the next year
         if upcoming_birthday < current_date:
-            upcoming_birthday = upcoming_birthday.replace(year=current_date.year + 1)
+            upcoming_birthday = birthday_in_year(user_birthday, current_date.year + 1)
 
         # Transfer to Monday if birthday falls on a weekend
         if upcoming_birthday.weekday() == 5:  # Saturday
@@ -31,6 +41,56 @@ def get_upcoming_birthdays(users):
     return upcoming_birthdays
 
 
+def month_day(birthday):
+    # "1985.03.17" -> 3 * 32 + 17; fixed-width strings skip strptime
+    if len(birthday) == 10 and birthday[4] == birthday[7] == "." and birthday.replace(".", "").isdigit():
+        parsed = date(int(birthday[:4]), int(birthday[5:7]), int(birthday[8:]))
+    else:
+        parsed = datetime.strptime(birthday, "%Y.%m.%d").date()
+    return parsed.month * 32 + parsed.day
+
+
+class BirthdayCalendar:
+    # Bulk version of get_upcoming_birthdays: birthdays are parsed once into an array of
+    # month/day keys sorted together with the user numbers, so every query only looks up
+    # the 8 days of the window instead of going through all users
+    def __init__(self, users):
+        self.names = [user["name"] for user in users]
+        keys = array("H", (month_day(user["birthday"]) for user in users))
+        self.order = array("I", sorted(range(len(keys)), key=keys.__getitem__))
+        self.keys = array("H", (keys[index] for index in self.order))
+
+    def born_on(self, month, day):
+        key = month * 32 + day
+        return self.order[bisect_left(self.keys, key):bisect_right(self.keys, key)]
+
+    def upcoming(self, today=None):
+        current_date = today or datetime.today().date()
+        found = []
+        for offset in range(8):
+            day = current_date + timedelta(days=offset)
+            users = list(self.born_on(day.month, day.day))
+            if day.month == 2 and day.day == 28 and (day + timedelta(days=1)).month == 3:
+                users += self.born_on(2, 29)  # no Feb 29 this year
+            if not users:
+                continue
+            # Transfer to Monday if birthday falls on a weekend
+            if day.weekday() >= 5:
+                day += timedelta(days=7 - day.weekday())
+            if (day - current_date).days > 7:
+                continue
+            congratulation_date = day.strftime("%Y.%m.%d")
+            found.extend((index, congratulation_date) for index in users)
+        # Same order as the users were given
+        found.sort()
+        return [{"name": self.names[index], "congratulation_date": congratulation_date}
+                for index, congratulation_date in found]
+
+
+def get_upcoming_birthdays_bulk(users, today=None):
+    return BirthdayCalendar(users).upcoming(today)
+
+
 users = [
     {"name": "John Doe", "birthday": "1985.03.17"},
     {"name": "Valera Smith", "birthday": "1990.03.09"},
@@ -41,5 +101,7 @@ users = [
 ]
 
 
-upcoming_birthdays = get_upcoming_birthdays(users)
-print('Список привітань на цьому тижні: ', upcoming_birthdays)
\ No newline at end of file
+if __name__ == "__main__":
+    upcoming_birthdays = get_upcoming_birthdays(users)
+    print('Список привітань на цьому тижні: ', upcoming_birthdays)
+    print('Список привітань (bulk): ', get_upcoming_birthdays_bulk(users))
@@ -1,42 +1,270 @@
+import argparse
+import glob
+import math
+import os
+import sys
+from array import array
+from collections import Counter
+from itertools import chain
+from multiprocessing import Pool
+
+BLOCK_SIZE = 16 * 1024 * 1024 # characters read at once
+PERCENTILES = (25, 50, 75, 90, 99)
+SKETCH_ACCURACY = 0.01 # relative error of percentiles from the sketch
+SKETCH_GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+# log index of the smallest positive float; keys are shifted by it so every non-zero value gets a key >= 1
+SKETCH_MIN_INDEX = math.ceil(math.log(math.ulp(0.0), SKETCH_GAMMA))
+
+
+def read_blocks(salary_file, block_size=BLOCK_SIZE):
+    # yield big blocks of whole lines, each ending with a newline
+    rest = ''
+    while True:
+        block = salary_file.read(block_size)
+        if not block:
+            break
+        block = rest + block
+        end = block.rfind('\n') + 1
+        rest = block[end:]
+        if end:
+            yield block[:end]
+    if rest:
+        yield rest + '\n'
+
+
+def parse_salary_lines(lines, first_line, salaries, errors):
+    # slow path: same checks as total_salary, line by line
+    for line_number, line in enumerate(lines, first_line):
+        line = line.strip() # remove spaces
+        if not line:
+            continue
+
+        parts = line.split(',') # split line
+        if len(parts) < 2: # check if line contains something after ,
+            errors.append((line_number, line, f"incorrect line -> {line}"))
+            continue
+
+        try:
+            salaries.append(float(parts[1].strip()))
+        except ValueError: # check if second could be convert into number
+            errors.append((line_number, line, f"Cannot convert to int -> {parts[1].strip()}"))
+
+
+def percentile(ordered, percent):
+    # linear interpolation between the closest ranks
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def read_salaries(path, errors, block_size=BLOCK_SIZE):
+    # columnar mode: the salary column of a whole block is parsed at once into array('d');
+    # blocks with empty or malformed lines go through the slow path, which collects
+    # (line number, line, message) into errors instead of printing them
+    salaries = array('d')
+    with open(path, 'r', encoding="utf-8") as salary_file:
+        line_number = 1
+        for block in read_blocks(salary_file, block_size):
+            line_count = block.count('\n')
+            # fields: name, salary, '\n' + name, salary, ... - if a line has no , or extra ones,
+            # some '\n' + name gets into a salary position
+            column = block.replace('\n', ',\n').split(',')[1::2]
+            try:
+                if block.count(',') != line_count or '\n' in ''.join(column):
+                    raise ValueError
+                salaries.extend(array('d', map(float, column)))
+            except ValueError:
+                parse_salary_lines(block.split('\n')[:-1], line_number, salaries, errors)
+            line_number += line_count
+    return salaries
+
+
+def salary_stats(path, percentiles=PERCENTILES, block_size=BLOCK_SIZE):
+    errors = []
+    salaries = read_salaries(path, errors, block_size)
+    stats = {"count": len(salaries), "total": math.fsum(salaries), "average": 0,
+             "min": None, "max": None, "median": None, "percentiles": {}, "errors": errors}
+    if salaries:
+        stats["average"] = stats["total"] / len(salaries)
+        stats["min"], stats["max"] = min(salaries), max(salaries)
+    if salaries and percentiles is not None: # percentiles=None skips sorting
+        ordered = sorted(salaries)
+        stats["median"] = percentile(ordered, 50)
+        stats["percentiles"] = {percent: percentile(ordered, percent) for percent in percentiles}
+    return stats
+
+
+def exact_sum(values):
+    # the sum as a few floats that add up to it exactly: each one is fsum of what is left,
+    # so fsum over such pieces of several files equals fsum over all their values
+    pieces = []
+    while True:
+        rest = math.fsum(chain(values, (-piece for piece in pieces)))
+        if not math.isfinite(rest): # inf or nan stays inf or nan after any merge
+            return [rest]
+        if not rest:
+            return pieces
+        pieces.append(rest)
+
+
+def sketch_key(value):
+    # log bucket of a salary: every value in a bucket is within SKETCH_ACCURACY of its middle
+    if value == 0:
+        return 0
+    if not math.isfinite(value):
+        return math.copysign(math.inf, value)
+    index = math.ceil(math.log(abs(value), SKETCH_GAMMA)) - SKETCH_MIN_INDEX + 1 # 0 is reserved for zero
+    index = max(index, 1)
+    return index if value > 0 else -index
+
+
+def sketch_value(key):
+    # middle of the bucket, inverse of sketch_key
+    if key == 0 or math.isinf(key):
+        return float(key)
+    value = 2 * SKETCH_GAMMA ** (abs(key) - 1 + SKETCH_MIN_INDEX) / (SKETCH_GAMMA + 1)
+    return value if key > 0 else -value
+
+
+def check_sketch(values=(0.25, 0.5, 0.75, 0.98, 1, 1.5, 1000, 1e-9, 3000.5, 1e300)):
+    # every value (and its negative) must come back from its bucket within SKETCH_ACCURACY
+    for value in values:
+        for signed in (value, -value):
+            key = sketch_key(signed)
+            assert key * signed > 0, (signed, key)
+            restored = sketch_value(key)
+            assert abs(restored - signed) <= SKETCH_ACCURACY * abs(signed) * (1 + 1e-9), (signed, restored)
+    assert sketch_key(0) == 0 and sketch_value(0) == 0
+
+
+def aggregate_file(path):
+    # partial result for one file; partial results are merged with merge_aggregates
+    errors = []
+    try:
+        salaries = read_salaries(path, errors)
+    except (OSError, UnicodeDecodeError) as e:
+        return {"count": 0, "sum": [], "min": None, "max": None, "sketch": {},
+                "errors": [(path, 0, "", f"Cannot read file -> {e}")]}
+    sketch = Counter()
+    for value, count in Counter(salaries).items(): # salaries repeat a lot, buckets are per value
+        sketch[sketch_key(value)] += count
+    return {"count": len(salaries), "sum": exact_sum(salaries),
+            "min": min(salaries, default=None), "max": max(salaries, default=None),
+            "sketch": dict(sketch),
+            "errors": [(path, line_number, line, message) for line_number, line, message in errors]}
+
+
+def merge_aggregates(parts):
+    # the order of parts does not change count, total, min, max or the sketch
+    merged = {"count": 0, "sum": [], "min": None, "max": None, "sketch": Counter(), "errors": []}
+    for part in parts:
+        merged["count"] += part["count"]
+        merged["sum"] = exact_sum(merged["sum"] + part["sum"])
+        for bound, pick in (("min", min), ("max", max)):
+            if part[bound] is not None:
+                current = merged[bound]
+                merged[bound] = part[bound] if current is None else pick(current, part[bound])
+        merged["sketch"].update(part["sketch"])
+        merged["errors"].extend(part["errors"])
+    merged["sketch"] = dict(merged["sketch"])
+    return merged
+
+
+def sketch_percentile(sketch, count, percent):
+    # value of the rank closest to percent, read from the buckets in increasing order
+    rank = round((count - 1) * percent / 100)
+    seen = 0
+    for key in sorted(sketch):
+        seen += sketch[key]
+        if seen > rank:
+            return sketch_value(key)
+
+
+def payroll_files(source):
+    # all files of a directory or everything matched by a glob pattern
+    if os.path.isdir(source):
+        paths = (os.path.join(source, name) for name in os.listdir(source))
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def payroll_report(source, percentiles=PERCENTILES, jobs=None):
+    # one report for many payroll files; files are processed in a pool of jobs processes
+    # (all cores by default or for jobs=0), jobs=1 processes them in this process
+    if jobs is not None and jobs < 0:
+        raise ValueError("jobs should not be negative")
+    jobs = jobs or None
+    files = payroll_files(source)
+    if jobs == 1 or len(files) < 2:
+        parts = map(aggregate_file, files)
+        merged = merge_aggregates(parts)
+    else:
+        with Pool(jobs) as pool:
+            merged = merge_aggregates(pool.imap(aggregate_file, files))
+    count = merged["count"]
+    total = math.fsum(merged["sum"])
+    report = {"files": len(files), "count": count, "total": total,
+              "average": total / count if count else 0,
+              "min": merged["min"], "max": merged["max"], "median": None, "percentiles": {},
+              "errors": merged["errors"]}
+    if count:
+        report["median"] = sketch_percentile(merged["sketch"], count, 50)
+        report["percentiles"] = {percent: sketch_percentile(merged["sketch"], count, percent)
+                                 for percent in percentiles}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Payroll report for a directory or glob of salary files")
+    parser.add_argument("source", help="directory or glob pattern, e.g. 'payroll/*.txt'")
+    parser.add_argument("--jobs", type=int, help="number of processes (default or 0: all cores)")
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 0:
+        parser.error("--jobs should not be negative")
+
+    report = payroll_report(args.source, jobs=args.jobs)
+    for path, line_number, line, message in report["errors"]:
+        print(f"Error: {path}:{line_number}: {message}", file=sys.stderr)
+    print(f"Files: {report['files']}, Salaries: {report['count']}")
+    print(f"Total salary: {report['total']}, Average salary: {report['average']}")
+    print(f"Min: {report['min']}, Max: {report['max']}, Median: {report['median']}")
+    for percent, value in report["percentiles"].items():
+        print(f"p{percent}: {value}")
+
+
 def total_salary(path):
-    salaries = []
     try:
-        with open(path, 'r', encoding="utf-8") as salary_file:
-            for line in salary_file:
-                line = line.strip() # remove spaces
-                if not line:
-                    continue
-
-                parts = line.split(',') # split line
-                if len(parts) < 2: # check if line contains something after ,
-                    print(f"Error: incorrect line -> {line}")
-                    continue
-
-                try:
-                    salary = float(parts[1].strip())
-                    salaries.append(salary)
-                except ValueError: # check if second could be convert into int 
-                    print(f"Error: Cannot convert to int -> {parts[1].strip()}")
+        stats = salary_stats(path, percentiles=None)
     except FileNotFoundError:
         print("File not found")
         return 0, 0
-    
-    if not salaries:  # check if there is one salary
+
+    for _, _, message in stats["errors"]:
+        print(f"Error: {message}")
+
+    if not stats["count"]:  # check if there is one salary
         print(f"File does not contain info about salaries")
-        return 0, 0 
+        return 0, 0
 
-    total = sum(salaries)
-    average = total / len(salaries)
+    return stats["total"], stats["average"]
 
-    return total, average
 
+if __name__ == "__main__" and len(sys.argv) > 1:
+    main()
+elif __name__ == "__main__":
+    check_sketch()
+    total, average = total_salary('university-python/goit-pycore-hw-04/hw1/salary.txt')
+    print(f'Total salary: {total}, Average salary: {average}')
 
-total, average = total_salary('university-python/goit-pycore-hw-04/hw1/salary.txt')
-print(f'Total salary: {total}, Average salary: {average}')
 
+    total, average = total_salary('university-python/goit-pycore-hw-04/hw1/salary1.txt')
+    print(f'Total salary: {total}, Average salary: {average}')
 
-total, average = total_salary('university-python/goit-pycore-hw-04/hw1/salary1.txt')
-print(f'Total salary: {total}, Average salary: {average}')
+    total, average = total_salary('university-python/goit-pycore-hw-04/hw1/salary2.txt')
+    print(f'Total salary: {total}, Average salary: {average}')
 
-total, average = total_salary('university-python/goit-pycore-hw-04/hw1/salary2.txt')
-print(f'Total salary: {total}, Average salary: {average}')
\ No newline at end of file
+    stats = salary_stats('university-python/goit-pycore-hw-04/hw1/salary.txt')
+    print(f"Min: {stats['min']}, Max: {stats['max']}, Median: {stats['median']}")
+    print(f"Percentiles: {stats['percentiles']}")
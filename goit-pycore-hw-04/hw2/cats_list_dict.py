@@ -1,24 +1,31 @@
-def get_cats_info(path):
-    cats = []
-    try:
-        with open(path, 'r', encoding="utf-8") as cats_file:
-            for line in cats_file:
-                line = line.strip() # remove spaces
-                if not line:
-                    continue
-
-                parts = line.split(',') # split line
-                if len(parts) < 3: # check if line is full
-                    print(f"Error: incorrect line -> {line}")
-                    continue
-                
-                try:                    
-                    age = int(parts[2].strip())
-                    cats.append({"id": parts[0], "name": parts[1], "age": age})
-                except ValueError:                    
-                    print(f"Error: invalid age value -> {parts[2].strip()} in line -> {line}")
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+def iter_cats(path):
+    # lazy version of get_cats_info: yields one cat at a time, file errors are raised
+    with open(path, 'r', encoding="utf-8") as cats_file:
+        for line in cats_file:
+            line = line.strip() # remove spaces
+            if not line:
+                continue
+
+            parts = line.split(',') # split line
+            if len(parts) < 3: # check if line is full
+                print(f"Error: incorrect line -> {line}")
+                continue
+
+            try:
+                age = int(parts[2].strip())
+            except ValueError:
+                print(f"Error: invalid age value -> {parts[2].strip()} in line -> {line}")
+                continue
+            yield {"id": parts[0], "name": parts[1], "age": age}
 
 
+def get_cats_info(path):
+    try:
+        cats = list(iter_cats(path))
     except FileNotFoundError:
         print("File not found")
         return []
@@ -33,11 +40,125 @@ def get_cats_info(path):
     return cats
 
 
-cats_info = get_cats_info('university-python/goit-pycore-hw-04/hw2/cats.txt')
-print(cats_info)
+class CatStore:
+    # compact storage for many cats: 12-byte ids in one bytearray, ages in array('i'),
+    # names packed into one utf-8 buffer; get(id) uses an open-addressing hash table
+    ID_SIZE = 12
+    EMPTY = -1
+
+    def __init__(self, cats=()):
+        self._ids = bytearray()
+        self._ages = array('i')
+        self._names = bytearray()
+        self._name_ends = array('Q')
+        self._slots = array('i', [self.EMPTY] * 8)
+        self._by_age = None # row numbers sorted by age, built on first age query
+        for cat in cats:
+            self.add(cat["id"], cat["name"], cat["age"])
+
+    @classmethod
+    def from_file(cls, path):
+        store = cls()
+        for cat in iter_cats(path):
+            try:
+                store.add(cat["id"], cat["name"], cat["age"])
+            except ValueError as e:
+                print(f"Error: {e}")
+        return store
+
+    def __len__(self):
+        return len(self._ages)
+
+    def __contains__(self, cat_id):
+        return self._find(cat_id) != self.EMPTY
+
+    def __iter__(self):
+        return (self._row(row) for row in range(len(self)))
+
+    @staticmethod
+    def _key(cat_id):
+        # ObjectId '60b90c1c13067a15887e1ae1' -> 12 bytes
+        try:
+            key = bytes.fromhex(cat_id)
+        except (TypeError, ValueError):
+            key = b""
+        if len(key) != CatStore.ID_SIZE:
+            raise ValueError(f"id must be 24 hex characters -> {cat_id}")
+        return key
+
+    def _probe(self, key):
+        # linear probing; returns the slot holding key or the empty slot where it belongs
+        mask = len(self._slots) - 1
+        slot = hash(key) & mask
+        while True:
+            row = self._slots[slot]
+            if row == self.EMPTY or self._ids[row * self.ID_SIZE:(row + 1) * self.ID_SIZE] == key:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _find(self, cat_id):
+        try:
+            key = self._key(cat_id)
+        except ValueError:
+            return self.EMPTY
+        return self._slots[self._probe(key)]
+
+    def _grow(self):
+        # keep the table at most half full
+        self._slots = array('i', [self.EMPTY] * (len(self._slots) * 2))
+        for row in range(len(self)):
+            key = bytes(self._ids[row * self.ID_SIZE:(row + 1) * self.ID_SIZE])
+            self._slots[self._probe(key)] = row
+
+    def _row(self, row):
+        start = self._name_ends[row - 1] if row else 0
+        return {"id": self._ids[row * self.ID_SIZE:(row + 1) * self.ID_SIZE].hex(),
+                "name": self._names[start:self._name_ends[row]].decode("utf-8"),
+                "age": self._ages[row]}
+
+    def add(self, cat_id, name, age):
+        key = self._key(cat_id)
+        slot = self._probe(key)
+        if self._slots[slot] != self.EMPTY:
+            raise ValueError(f"duplicate id -> {cat_id}")
+        # everything is checked before the columns change, so a bad cat leaves no partial row
+        if not isinstance(age, int) or not -2 ** 31 <= age < 2 ** 31:
+            raise ValueError(f"age out of range -> {age}")
+        encoded = name.encode("utf-8")
+        row = len(self)
+        self._ids += key
+        self._ages.append(age)
+        self._names += encoded
+        self._name_ends.append(len(self._names))
+        self._slots[slot] = row
+        self._by_age = None
+        if len(self) * 2 > len(self._slots):
+            self._grow()
+
+    def get(self, cat_id, default=None):
+        row = self._find(cat_id)
+        return default if row == self.EMPTY else self._row(row)
+
+    def age_range(self, low, high):
+        # cats with low <= age <= high, youngest first
+        if self._by_age is None:
+            self._by_age = array('i', sorted(range(len(self)), key=self._ages.__getitem__))
+        age = self._ages.__getitem__
+        start = bisect_left(self._by_age, low, key=age)
+        end = bisect_right(self._by_age, high, key=age)
+        return (self._row(row) for row in self._by_age[start:end])
+
+
+if __name__ == "__main__":
+    cats_info = get_cats_info('university-python/goit-pycore-hw-04/hw2/cats.txt')
+    print(cats_info)
+
+    cats_info = get_cats_info('university-python/goit-pycore-hw-04/hw2/cats1.txt')
+    print(cats_info)
 
-cats_info = get_cats_info('university-python/goit-pycore-hw-04/hw2/cats1.txt')
-print(cats_info)
+    cats_info = get_cats_info('university-python/goit-pycore-hw-04/hw2/cats2.txt')
+    print(cats_info)
 
-cats_info = get_cats_info('university-python/goit-pycore-hw-04/hw2/cats2.txt')
-print(cats_info)
\ No newline at end of file
+    cats = CatStore.from_file('university-python/goit-pycore-hw-04/hw2/cats.txt')
+    print(cats.get('60b90c1c13067a15887e1ae1'))
+    print(list(cats.age_range(1, 2)))
@@ -1,12 +1,31 @@
+import argparse
+import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from colorama import Fore, Style, init
 
 # Initiation colorama
 init(autoreset=True)
 
-def print_directory_structure(path: Path, indent: str = ""):
+CHUNK_LINES = 1000 # lines written to the terminal at once
+PREFETCH = 32 # subdirectories listed ahead of the walk in every open directory
+SUMMARY_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "hw03-tree", "summary.json")
+
+
+def list_directory(path):
+    # One scandir call: DirEntry caches the entry type, so no extra stat per entry
+    try:
+        with os.scandir(path) as entries:
+            return [(entry.name, entry.path, entry.is_dir(), entry.is_file(), entry.is_symlink())
+                    for entry in entries], None
+    except OSError as error:
+        return [], error
+
+
+def print_directory_structure(path: Path, indent: str = "", max_depth: int = None,
+                              limit: int = None, workers: int = 8):
     # check which way is the same as the directory
     if not path.exists():
         print(Fore.RED + f"Error: Path '{path}' does not exist.")
@@ -14,27 +33,208 @@ def print_directory_structure(path: Path, indent: str = ""):
     if not path.is_dir():
         print(Fore.RED + f"Error: Path '{path}' is not a directory.")
         return
-    
-    # Looping through directory
-    for entry in path.iterdir():
-        # What is this subdirectory?
-        if entry.is_dir():
-            print(Fore.CYAN + f"{indent}📂 {entry.name}")
-            # Recursively click for subdirectories
-            print_directory_structure(entry, indent + "  ")
-        # If file
-        elif entry.is_file():
-            print(Fore.GREEN + f"{indent}📜 {entry.name}")
+
+    lines = []
+    printed = 0
+
+    def flush():
+        sys.stdout.write("".join(lines))
+        sys.stdout.flush()
+        lines.clear()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def frame(listing, depth):
+            # One open directory of the walk: its entries, the next entry to print
+            # and the listings of its subdirectories that are already requested
+            entries, error = listing
+            if error is not None:
+                lines.append(Fore.RED + f"{indent + '  ' * (depth - 1)}Error: {error}" + Style.RESET_ALL + "\n")
+            return {"entries": entries, "depth": depth, "next": 0, "ahead": 0, "listings": {}}
+
+        def prefetch(top):
+            # Request listings of the next subdirectories before the walk reaches them
+            if max_depth is not None and top["depth"] >= max_depth:
+                return
+            entries = top["entries"]
+            while top["ahead"] < len(entries) and len(top["listings"]) < PREFETCH:
+                name, entry_path, is_dir, is_file, is_symlink = entries[top["ahead"]]
+                if is_dir and not is_symlink: # symlinked directories are shown but not entered
+                    top["listings"][top["ahead"]] = pool.submit(list_directory, entry_path)
+                top["ahead"] += 1
+
+        # Iterative depth-first walk, so deep trees do not hit the recursion limit
+        stack = [frame(list_directory(path), 1)]
+        while stack and (limit is None or printed < limit):
+            top = stack[-1]
+            if top["next"] == len(top["entries"]):
+                stack.pop()
+                continue
+            prefetch(top)
+            index = top["next"]
+            top["next"] += 1
+            name, entry_path, is_dir, is_file, is_symlink = top["entries"][index]
+            prefix = indent + "  " * (top["depth"] - 1)
+            # What is this subdirectory?
+            if is_dir:
+                lines.append(Fore.CYAN + f"{prefix}📂 {name}" + Style.RESET_ALL + "\n")
+                printed += 1
+                listing = top["listings"].pop(index, None)
+                if listing is not None:
+                    stack.append(frame(listing.result(), top["depth"] + 1))
+            # If file
+            elif is_file:
+                lines.append(Fore.GREEN + f"{prefix}📜 {name}" + Style.RESET_ALL + "\n")
+                printed += 1
+            if len(lines) >= CHUNK_LINES:
+                flush()
+        flush()
+        # Stopped early: listings requested ahead are no longer needed
+        for top in stack:
+            for listing in top["listings"].values():
+                listing.cancel()
+
+
+def scan_directory(path, cached):
+    # Files and bytes directly in one directory and its subdirectory names.
+    # A directory whose mtime did not change since the cached scan is not listed again
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        if cached is not None and cached["mtime"] == mtime:
+            return cached
+        files = size = 0
+        dirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif entry.is_file(follow_symlinks=False):
+                    files += 1
+                    size += entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        return None
+    return {"mtime": mtime, "files": files, "bytes": size, "dirs": dirs}
+
+
+def load_summary_cache(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_summary_cache(cache_path, cache):
+    # Written to a temporary file first, so an interrupted run keeps the old cache
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    temporary_path = cache_path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as cache_file:
+        json.dump(cache, cache_file)
+    os.replace(temporary_path, cache_path)
+
+
+def directory_sizes(path: Path, cache_path: str = SUMMARY_CACHE, workers: int = 8):
+    # Total bytes and files of every subtree: {directory: (bytes, files)}.
+    # Directories are scanned level by level on a thread pool. Note that the cache is keyed by
+    # directory mtime, which changes when entries are added, removed or renamed, but not when
+    # a file inside is rewritten with a different size
+    root = os.path.abspath(path)
+    cache = load_summary_cache(cache_path)
+    scanned = {}
+    order = []
+    level = [root]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while level:
+            results = pool.map(lambda directory: scan_directory(directory, cache.get(directory)), level)
+            next_level = []
+            for directory, result in zip(level, results):
+                if result is None: # unreadable or removed during the walk
+                    continue
+                scanned[directory] = result
+                order.append(directory)
+                next_level.extend(os.path.join(directory, name) for name in result["dirs"])
+            level = next_level
+
+    # Children come after their parents in order, so one reverse pass sums the subtrees
+    totals = {}
+    for directory in reversed(order):
+        entry = scanned[directory]
+        size, files = entry["bytes"], entry["files"]
+        for name in entry["dirs"]:
+            child = totals.get(os.path.join(directory, name))
+            if child is not None:
+                size += child[0]
+                files += child[1]
+        totals[directory] = (size, files)
+
+    # Directories of this tree that were not seen this time are gone
+    prefix = os.path.join(root, "")
+    for directory in [key for key in cache if key == root or key.startswith(prefix)]:
+        if directory not in scanned:
+            del cache[directory]
+    cache.update(scanned)
+    save_summary_cache(cache_path, cache)
+    return totals
+
+
+def human_size(size):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+def print_directory_summary(path: Path, top: int = 10, cache_path: str = SUMMARY_CACHE, workers: int = 8):
+    # check which way is the same as the directory
+    if not path.exists():
+        print(Fore.RED + f"Error: Path '{path}' does not exist.")
+        return
+    if not path.is_dir():
+        print(Fore.RED + f"Error: Path '{path}' is not a directory.")
+        return
+
+    totals = directory_sizes(path, cache_path, workers)
+    root = os.path.abspath(path)
+    if root not in totals:
+        # the root itself could not be listed, show why the same way the tree does
+        try:
+            os.scandir(root).close()
+            error = f"Cannot list '{path}'."
+        except OSError as e:
+            error = e
+        print(Fore.RED + f"Error: {error}" + Style.RESET_ALL)
+        return
+    size, files = totals[root]
+    print(Fore.CYAN + f"📂 {path}: {human_size(size)} in {files} files")
+    # Largest subtrees below the root
+    largest = sorted((item for item in totals.items() if item[0] != root),
+                     key=lambda item: item[1][0], reverse=True)[:top]
+    for directory, (size, files) in largest:
+        print(Fore.GREEN + f"{human_size(size):>10}  {files:>8} files  {os.path.relpath(directory, root)}")
+
 
 # Main part of the script
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print a directory tree")
+    parser.add_argument("path", help="path to the directory")
+    parser.add_argument("--max-depth", type=int, help="show entries at most this many levels deep")
+    parser.add_argument("--limit", type=int, help="stop after this many entries")
+    parser.add_argument("--workers", type=int, default=8, help="threads that list directories")
+    parser.add_argument("--summary", action="store_true", help="show sizes of the largest subtrees")
+    parser.add_argument("--top", type=int, default=10, help="subtrees shown by --summary")
+    parser.add_argument("--cache", default=SUMMARY_CACHE, help="cache file for --summary")
     # Checking the validity of a command line argument
-    if len(sys.argv) != 2:
-        print(Fore.RED + "Usage: python hw03.py <path_to_directory>")
+    if len(sys.argv) < 2:
+        print(Fore.RED + "Usage: python hw03.py <path_to_directory> [--max-depth N] [--limit N]")
         sys.exit(1)
+    args = parser.parse_args()
+    if args.summary and (args.max_depth is not None or args.limit is not None):
+        parser.error("--summary walks the whole tree, --max-depth and --limit do not apply")
 
-    directory_path = sys.argv[1]
-    directory = Path(directory_path)
+    directory = Path(args.path)
 
-    # The directory structure is displayed
-    print_directory_structure(directory)
+    if args.summary:
+        print_directory_summary(directory, top=args.top, cache_path=args.cache, workers=args.workers)
+    else:
+        # The directory structure is displayed
+        print_directory_structure(directory, max_depth=args.max_depth, limit=args.limit,
+                                  workers=args.workers)
@@ -1,24 +1,59 @@
-def caching_fibonacci():
-    cache = {}
+from collections import OrderedDict
+
+
+def fibonacci_pair(n, cache=None, maxsize=None):
+    # (F(n), F(n + 1)) by fast doubling: one step per bit of n, from the highest bit.
+    # After each step (a, b) is the pair for a prefix of n's bits, so cached pairs
+    # of prefixes (n >> shift) let later calls skip the first steps
+    a, b = 0, 1
+    start = n.bit_length()
+    if cache:
+        for shift in range(n.bit_length()):
+            if n >> shift in cache:
+                a, b = cache[n >> shift]
+                cache.move_to_end(n >> shift)
+                start = shift
+                break
+
+    for shift in range(start - 1, -1, -1):
+        c = a * (2 * b - a)  # F(2k)
+        d = a * a + b * b  # F(2k + 1)
+        if (n >> shift) & 1:
+            a, b = d, c + d
+        else:
+            a, b = c, d
+        if cache is not None:
+            cache[n >> shift] = (a, b)
+            if maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)  # drop the least recently used pair
+    return a, b
+
+
+def caching_fibonacci(maxsize=128):
+    # maxsize pairs are kept in an LRU cache, maxsize=None - no limit, 0 - no cache
+    cache = OrderedDict() if maxsize != 0 else None
 
     def fibonacci(n):
         if n <= 0:
             return 0
-        if n == 1:
-            return 1
-        if n in cache:
-            return cache[n]
-        
-        cache[n] = fibonacci(n - 1) + fibonacci(n - 2)
-        print(cache[n])
-        return cache[n]
-    
+        return fibonacci_pair(n, cache, maxsize)[0]
+
     return fibonacci
 
 
+def fib_many(ns, maxsize=128):
+    # values for a batch of n; going from small to large n lets every request
+    # start from the pairs cached for shared bit prefixes
+    fibonacci = caching_fibonacci(maxsize)
+    values = {n: fibonacci(n) for n in sorted(set(ns))}
+    return [values[n] for n in ns]
+
+
 # get function fibonacci
 fib = caching_fibonacci()
 
 
-print(fib(10))
-print(fib(15))
+if __name__ == "__main__":
+    print(fib(10))
+    print(fib(15))
+    print(fib_many([10, 15, 20]))
@@ -1,14 +1,65 @@
 import re
+from decimal import Decimal
 from typing import Callable
 
-def generator_numbers(text: str):
-    for match in re.findall(r'\d+\.\d+', text):  # looking for a number in the format 123.45
-        yield float(match)  # Convert to float and return
+NUMBER = re.compile(r'\d+\.\d+')  # a number in the format 123.45
+NUMBER_BYTES = re.compile(rb'\d+\.\d+')
+CHUNK_SIZE = 1024 * 1024  # characters (or bytes) read from a file at once
 
-def sum_profit(text: str, func: Callable):
+
+def iter_chunks(source, chunk_size: int = CHUNK_SIZE):
+    # text, file object (text or binary) or any iterable of str/bytes chunks
+    if isinstance(source, (str, bytes)):
+        yield source
+    elif hasattr(source, 'read'):
+        while chunk := source.read(chunk_size):
+            yield chunk
+    else:
+        yield from source
+
+
+def split_tail(text):
+    # a trailing run of digits and dots can go on in the next chunk, so it is kept back;
+    # the rest can not share a number with the next chunk
+    if isinstance(text, bytes):
+        body = text.rstrip(b'0123456789.')
+    else:
+        body = text.rstrip('0123456789.')
+        while body and body[-1].isdecimal():  # \d also matches non-ASCII digits
+            body = body[:-1].rstrip('0123456789.')
+    return body, text[len(body):]
+
+
+def numbers_in(text, exact: bool = False):
+    pattern = NUMBER_BYTES if isinstance(text, bytes) else NUMBER
+    for match in pattern.finditer(text):  # looking for a number in the format 123.45
+        number = match.group()
+        if exact:
+            yield Decimal(number.decode() if isinstance(number, bytes) else number)
+        else:
+            yield float(number)  # Convert to float and return
+
+
+def generator_numbers(text, exact: bool = False):
+    # numbers from a text, a file or chunks, found with finditer chunk by chunk,
+    # so memory does not depend on the size of the input
+    tail = None
+    for chunk in iter_chunks(text):
+        body, tail = split_tail(chunk if tail is None else tail + chunk)
+        yield from numbers_in(body, exact)
+    if tail:
+        yield from numbers_in(tail, exact)
+
+
+def sum_profit(text, func: Callable, exact: bool = False):
+    # exact=True sums Decimal values, without float rounding
+    if exact:
+        return sum(func(text, exact=True), Decimal(0))
     return sum(func(text))  # call the passed generator and sum all its values
 
 
-text = "Загальний дохід працівника складається з декількох частин: 1000.01 як основний дохід, доповнений додатковими надходженнями 27.45 і 324.00 доларів."
-total_income = sum_profit(text, generator_numbers)
-print(f'Загальний дохід: {total_income:.2f}')  # Round to 2 decimal places
\ No newline at end of file
+if __name__ == "__main__":
+    text = "Загальний дохід працівника складається з декількох частин: 1000.01 як основний дохід, доповнений додатковими надходженнями 27.45 і 324.00 доларів."
+    total_income = sum_profit(text, generator_numbers)
+    print(f'Загальний дохід: {total_income:.2f}')  # Round to 2 decimal places
+    print(f'Загальний дохід (Decimal): {sum_profit(text, generator_numbers, exact=True)}')
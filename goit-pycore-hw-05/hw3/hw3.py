@@ -1,5 +1,19 @@
+import argparse
+import io
+import json
+import locale
+import mmap
+import os
+import re
+import shutil
+import stat
 import sys
+import tempfile
+from bisect import bisect_left
 from collections import defaultdict
+from itertools import chain
+from multiprocessing import Pool
+from typing import Iterable, Iterator, TextIO
 
 # Функція для парсингу рядка логу
 def parse_log_line(line: str) -> dict:
@@ -13,32 +27,327 @@ def parse_log_line(line: str) -> dict:
         'message': message
     }
 
-# Функція для завантаження логів з файлу
-def load_logs(file_path: str) -> list:
-    logs = []
+# Генератор записів логу: файл читається рядок за рядком і не зберігається в пам'яті
+def iter_logs(file_path: str) -> Iterator[dict]:
     try:
         with open(file_path, 'r') as file:
             for line in file:
-                logs.append(parse_log_line(line.strip()))
+                yield parse_log_line(line.strip())
     except FileNotFoundError:
         print(f"Файл не знайдено: {file_path}")
         sys.exit(1)
     except Exception as e:
         print(f"Помилка при читанні файлу: {e}")
         sys.exit(1)
-    return logs
+
+# Функція для завантаження логів з файлу
+def load_logs(file_path: str) -> list:
+    return list(iter_logs(file_path))
 
 # Функція для фільтрації логів за рівнем
-def filter_logs_by_level(logs: list, level: str) -> list:
-    return [log for log in logs if log['level'].lower() == level.lower()]
+def filter_logs_by_level(logs: Iterable[dict], level: str) -> Iterator[dict]:
+    level = level.lower()
+    return (log for log in logs if log['level'].lower() == level)
 
 # Функція для підрахунку записів за рівнем
-def count_logs_by_level(logs: list) -> dict:
+def count_logs_by_level(logs: Iterable[dict]) -> dict:
     counts = defaultdict(int)
     for log in logs:
         counts[log['level']] += 1
     return dict(counts)
 
+# Функція, що за один прохід фільтрує записи за рівнем, рахує їх і записує деталі у details
+def count_and_filter_logs(logs: Iterable[dict], level: str, details: TextIO) -> dict:
+    counts = defaultdict(int)
+    for log in filter_logs_by_level(logs, level):
+        counts[log['level']] += 1
+        details.write(f"{log['date_time']} - {log['message']}\n")
+    return dict(counts)
+
+# Звичайний рядок логу: дата і час без пробілів, рівень і непорожнє повідомлення
+RECORD_PATTERN = re.compile(rb'[!-~]+ [!-~]+ ([!-~]+) [!-~\x80-\xff]')
+
+# Функція, що будує шаблон для цілого блоку рядків, рівні яких уже відомі
+def records_pattern(levels) -> re.Pattern:
+    if not levels:
+        return re.compile(b'')
+    alternatives = b'|'.join(re.escape(level) for level in sorted(levels, key=len, reverse=True))
+    return re.compile(rb'(?:[!-~]++ [!-~]++ (?:' + alternatives + rb') [!-~\x80-\xff].*+\n)*+')
+
+# Розмір вікна, яке швидкий підрахунок обробляє за раз
+WINDOW_SIZE = 16 * 1024 * 1024
+
+# Функція для підрахунку рівнів у байтах buffer[start:end] без створення об'єктів для рядків.
+# Регулярний вираз лише перевіряє, що кожен рядок має відомий рівень, а самі рівні рахує bytes.count.
+# Повертає None для незвичайних рядків (порожніх, з пробілами на початку, з '\r' всередині) -
+# їх точно обробить звичайний розбір
+def count_levels_in_buffer(buffer, start: int, end: int) -> dict:
+    counts = {}
+    position = start
+    while position < end:
+        window_end = buffer.find(b'\n', min(position + WINDOW_SIZE, end) - 1, end)
+        window_end = end if window_end < 0 else window_end + 1
+        window = buffer[position:window_end]
+        if not window.endswith(b'\n'):
+            window += b'\n'
+        if b'\r' in window and window.count(b'\r') != window.count(b'\r\n'):
+            return None
+        checked = 0
+        while checked < len(window):
+            checked = records_pattern(counts).match(window, checked).end()
+            if checked < len(window):
+                # Рядок з новим рівнем: додаємо рівень і перевіряємо далі з цього ж рядка
+                record = RECORD_PATTERN.match(window, checked)
+                if record is None or record.group(1) in counts:
+                    return None
+                counts[record.group(1)] = 0
+        found = {level: window.count(b' ' + level + b' ') for level in counts}
+        # Кожен рядок містить свій рівень хоча б раз, тож рівність означає, що зайвих збігів немає
+        if sum(found.values()) != window.count(b'\n'):
+            return None
+        for level, count in found.items():
+            counts[level] += count
+        position = window_end
+    return counts
+
+# Функція для швидкого підрахунку записів за рівнем: файл відображається в пам'ять,
+# і рівні рахуються по байтах без розбору окремих рядків. Для каналів, FIFO та файлів /proc,
+# розмір яких невідомий або нульовий, повертає None - їх рахує звичайний розбір
+def count_levels_fast(file_path: str) -> dict:
+    try:
+        with open(file_path, 'rb') as file:
+            info = os.fstat(file.fileno())
+            if not stat.S_ISREG(info.st_mode) or info.st_size == 0:
+                return None
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                counts = count_levels_in_buffer(buffer, 0, info.st_size)
+    except FileNotFoundError:
+        print(f"Файл не знайдено: {file_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Помилка при читанні файлу: {e}")
+        sys.exit(1)
+    if counts is None:
+        return None
+    return {level.decode('ascii'): count for level, count in counts.items()}
+
+# Розмір частини файлу для паралельного розбору
+CHUNK_SIZE = 32 * 1024 * 1024
+
+# Функція, що ділить файл на частини (початок, кінець), які закінчуються на межі рядка
+def split_into_chunks(file_path: str, chunk_size: int = CHUNK_SIZE) -> list:
+    chunks = []
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_size, size) - 1)
+            file.readline()  # Дочитуємо рядок, на який припала межа
+            end = file.tell()
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+# Функція, що повертає таке саме кодування, як у open(file_path, 'r') в послідовному режимі
+def log_encoding() -> str:
+    return 'utf-8' if sys.flags.utf8_mode else locale.getpreferredencoding(False)
+
+# Генератор записів логу з байтів частини файлу
+def decode_logs(data: bytes) -> Iterator[dict]:
+    for line in io.StringIO(data.decode(log_encoding()), newline=None):
+        yield parse_log_line(line.strip())
+
+# Функція для підрахунку записів за рівнем у байтах частини файлу
+def count_levels_in_bytes(data: bytes) -> dict:
+    counts = count_levels_in_buffer(data, 0, len(data))
+    if counts is None:
+        return count_logs_by_level(decode_logs(data))
+    return {name.decode('ascii'): count for name, count in counts.items()}
+
+# Функція для розбору однієї частини файлу в окремому процесі
+def scan_chunk(task: tuple) -> tuple:
+    file_path, start, end, level = task
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    if level is None:
+        return count_levels_in_bytes(data), ''
+    details = io.StringIO()
+    counts = count_and_filter_logs(decode_logs(data), level, details)
+    return counts, details.getvalue()
+
+# Функція для паралельного розбору логу в jobs процесах; частини об'єднуються в порядку файлу,
+# тому результат збігається з послідовним розбором. Канали, FIFO та файли /proc не мають розміру,
+# за яким їх можна поділити на частини, тож вони розбираються послідовно
+def scan_logs_parallel(file_path: str, level: str, details: TextIO, jobs: int) -> dict:
+    counts = defaultdict(int)
+    try:
+        info = os.stat(file_path)
+        if not stat.S_ISREG(info.st_mode) or info.st_size == 0:
+            if level:
+                return count_and_filter_logs(iter_logs(file_path), level, details)
+            return count_logs_by_level(iter_logs(file_path))
+        tasks = [(file_path, start, end, level) for start, end in split_into_chunks(file_path)]
+        with Pool(jobs) as pool:
+            for chunk_counts, chunk_details in pool.imap(scan_chunk, tasks):
+                for name, count in chunk_counts.items():
+                    counts[name] += count
+                details.write(chunk_details)
+    except FileNotFoundError:
+        print(f"Файл не знайдено: {file_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Помилка при читанні файлу: {e}")
+        sys.exit(1)
+    return dict(counts)
+
+# Скільки байтів перед збереженим зміщенням запам'ятовується, щоб помітити перезаписаний лог
+FINGERPRINT_SIZE = 256
+
+# Функція для читання стану попереднього запуску (--follow) або індексу часу
+def load_state(state_path: str) -> dict:
+    try:
+        with open(state_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+# Функція для атомарного збереження стану: перерваний запис не зіпсує попередній стан
+def save_state(state_path: str, state: dict):
+    temporary_path = state_path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump(state, file)
+    os.replace(temporary_path, state_path)
+
+# Функція, що визначає, з якого байта продовжити розбір. Лог читається з початку, якщо його
+# замінили іншим файлом (ротація), обрізали або перезаписали до збереженого зміщення
+def resume_offset(file, info: os.stat_result, state: dict) -> int:
+    if state is None or (state['device'], state['inode']) != (info.st_dev, info.st_ino):
+        return 0
+    offset = state['offset']
+    if info.st_size < offset:
+        return 0
+    start = max(offset - FINGERPRINT_SIZE, 0)
+    file.seek(start)
+    if file.read(offset - start).hex() != state['fingerprint']:
+        return 0
+    return offset
+
+# Функція для режиму --follow: розбирає лише рядки, дописані після попереднього запуску,
+# і додає їх до збережених лічильників. Останній рядок без символу нового рядка ще може дописуватися,
+# тому в стан він не потрапляє: його врахує наступний запуск, коли рядок буде завершено.
+# Показується такий рядок лише тоді, коли він уже розбирається як запис; напівзаписаний рядок пропускається
+def follow_logs(file_path: str, level: str, details: TextIO, state_path: str) -> dict:
+    state = load_state(state_path)
+    try:
+        with open(file_path, 'rb') as file:
+            info = os.fstat(file.fileno())
+            offset = resume_offset(file, info, state)
+            totals = state['counts'] if offset else {}
+            file.seek(offset)
+            data = file.read(info.st_size - offset)
+            complete = data.rfind(b'\n') + 1
+            for name, count in count_levels_in_bytes(data[:complete]).items():
+                totals[name] = totals.get(name, 0) + count
+            try:
+                tail = list(decode_logs(data[complete:]))
+            except (IndexError, UnicodeDecodeError):
+                tail = []  # Рядок ще не дописано до кінця
+            shown = dict(totals)
+            for name, count in count_logs_by_level(tail).items():
+                shown[name] = shown.get(name, 0) + count
+            if level:
+                count_and_filter_logs(chain(decode_logs(data[:complete]), tail), level, details)
+            offset += complete
+            file.seek(max(offset - FINGERPRINT_SIZE, 0))
+            fingerprint = file.read(min(offset, FINGERPRINT_SIZE)).hex()
+    except FileNotFoundError:
+        print(f"Файл не знайдено: {file_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Помилка при читанні файлу: {e}")
+        sys.exit(1)
+    save_state(state_path, {
+        'device': info.st_dev,
+        'inode': info.st_ino,
+        'offset': offset,
+        'fingerprint': fingerprint,
+        'counts': totals,
+    })
+    if level:
+        return {name: count for name, count in shown.items() if name.lower() == level}
+    return shown
+
+# Крок розрідженого індексу часу: одна позначка приблизно на кожен мегабайт логу
+INDEX_STEP = 1024 * 1024
+
+# Функція, що повертає дату й час з початку рядка логу в байтах
+def line_time(line: bytes) -> str:
+    return ' '.join(line.strip().decode(log_encoding()).split(' ', 2)[:2])
+
+# Функція, що доповнює розріджений індекс [(дата й час, зміщення рядка), ...] у файлі index_path.
+# Для дописаного логу індексується лише нова частина, для заміненого чи обрізаного - весь файл
+def update_time_index(file, info: os.stat_result, index_path: str) -> list:
+    index = load_state(index_path)
+    offset = resume_offset(file, info, index)
+    entries = index['entries'] if offset else []
+    if offset == info.st_size:
+        return entries
+    target = entries[-1][1] + INDEX_STEP if entries else 0
+    while target < info.st_size:
+        file.seek(max(target - 1, 0))
+        if target:
+            file.readline()  # Переходимо на початок наступного рядка
+        start = file.tell()
+        line = file.readline()
+        if not line.endswith(b'\n'):
+            break
+        entries.append([line_time(line), start])
+        target = start + INDEX_STEP
+    file.seek(max(info.st_size - FINGERPRINT_SIZE, 0))
+    try:
+        save_state(index_path, {
+            'device': info.st_dev,
+            'inode': info.st_ino,
+            'offset': info.st_size,
+            'fingerprint': file.read(min(info.st_size, FINGERPRINT_SIZE)).hex(),
+            'entries': entries,
+        })
+    except OSError:
+        pass  # Індекс лише прискорює запити: якщо його не можна зберегти, запит обробляється з індексу в пам'яті
+    return entries
+
+# Генератор записів з проміжку часу [since, until]; until включає всі записи з таким початком,
+# тобто '2024-01-22 09:15' охоплює і 09:15:59. Записи в лозі мають бути впорядковані за часом
+def logs_in_window(logs: Iterable[dict], since: str, until: str) -> Iterator[dict]:
+    for log in logs:
+        if since and log['date_time'] < since:
+            continue
+        if until and log['date_time'][:len(until)] > until:
+            break
+        yield log
+
+# Функція для запитів --since/--until: за індексом знаходить зміщення перед початком проміжку
+# і розбирає лише рядки з цього місця до кінця проміжку
+def scan_time_window(file_path: str, level: str, details: TextIO, since: str, until: str) -> dict:
+    try:
+        with open(file_path, 'rb') as file:
+            entries = update_time_index(file, os.fstat(file.fileno()), file_path + '.idx')
+            # Остання позначка, строго раніша за since: рядки з часом since можуть бути й перед позначкою
+            found = bisect_left([time for time, _ in entries], since) - 1 if since else 0
+            file.seek(entries[max(found, 0)][1] if entries else 0)
+            lines = io.TextIOWrapper(file, encoding=log_encoding(), newline=None)
+            logs = logs_in_window((parse_log_line(line.strip()) for line in lines), since, until)
+            if level:
+                return count_and_filter_logs(logs, level, details)
+            return count_logs_by_level(logs)
+    except FileNotFoundError:
+        print(f"Файл не знайдено: {file_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Помилка при читанні файлу: {e}")
+        sys.exit(1)
+
 # Функція для відображення підрахунку записів
 def display_log_counts(counts: dict):
     print(f"{'Рівень логування':<20} | {'Кількість'}")
@@ -51,21 +360,52 @@ def main():
     if len(sys.argv) < 2:
         print("Будь ласка, вкажіть шлях до лог-файлу.")
         sys.exit(1)
-    
-    file_path = sys.argv[1]
-    logs = load_logs(file_path)
+
+    parser = argparse.ArgumentParser(description="Підрахунок записів лог-файлу за рівнями логування.")
+    parser.add_argument('file_path', help="шлях до лог-файлу")
+    parser.add_argument('level', nargs='?', help="рівень логування, для якого показати деталі")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="кількість процесів для паралельного розбору (0 - усі ядра)")
+    parser.add_argument('--follow', action='store_true',
+                        help="розбирати лише рядки, дописані після попереднього запуску")
+    parser.add_argument('--state', help="файл стану для --follow (типово <лог-файл>.state)")
+    parser.add_argument('--since', help="лише записи, не раніші за цей час, напр. '2024-01-22 09:00'")
+    parser.add_argument('--until', help="лише записи, не пізніші за цей час, напр. '2024-01-22 09:15'")
+    args = parser.parse_intermixed_args()
+    if args.follow and args.jobs != 1:
+        parser.error("--follow не поєднується з --jobs: нові дані розбираються в одному процесі")
+    if args.state and not args.follow:
+        parser.error("--state використовується лише разом з --follow")
+    window = args.since or args.until
+    if window and (args.follow or args.jobs != 1):
+        parser.error("--since/--until не поєднуються з --follow і --jobs")
+    if args.since and args.until and args.since[:len(args.until)] > args.until:
+        parser.error("--since має бути не пізніше за --until")
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
 
     # Перевірка на другий аргумент для фільтрації за рівнем
-    if len(sys.argv) == 3:
-        level = sys.argv[2].lower()
-        logs = filter_logs_by_level(logs, level)
-        display_log_counts(count_logs_by_level(logs))
-        print(f"\nДеталі логів для рівня '{level.upper()}':")
-        for log in logs:
-            print(f"{log['date_time']} - {log['message']}")
-    else:
-        counts = count_logs_by_level(logs)
+    level = args.level.lower() if args.level else None
+    # Деталі накопичуються у тимчасовому файлі, щоб вивести їх після таблиці, не читаючи лог вдруге
+    with tempfile.TemporaryFile('w+') as details:
+        if window:
+            counts = scan_time_window(args.file_path, level, details, args.since, args.until)
+        elif args.follow:
+            counts = follow_logs(args.file_path, level, details, args.state or args.file_path + '.state')
+        elif jobs > 1:
+            counts = scan_logs_parallel(args.file_path, level, details, jobs)
+        elif level:
+            counts = count_and_filter_logs(iter_logs(args.file_path), level, details)
+        else:
+            counts = count_levels_fast(args.file_path)
+            if counts is None:
+                # Не звичайний файл або рядки без рівня: звичайний розбір повідомить про помилку так само, як раніше
+                counts = count_logs_by_level(iter_logs(args.file_path))
         display_log_counts(counts)
+        if level:
+            print(f"\nДеталі логів для рівня '{level.upper()}':")
+            sys.stdout.flush()
+            details.seek(0)
+            shutil.copyfileobj(details, sys.stdout)
 
 if __name__ == "__main__":
     main()
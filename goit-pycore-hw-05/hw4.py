@@ -12,7 +12,7 @@ def input_error(func):
 
 
 def parse_input(user_input):
-    cmd, *args = user_input.split()
+    cmd, *args = user_input.split() or [""]
     cmd = cmd.strip().lower()
     return cmd, args
 
@@ -45,6 +45,43 @@ def show_all(contacts):
     return "\n".join([f"{name}: {phone}" for name, phone in contacts.items()])
 
 
+class CommandRegistry:
+    # copy of CommandRegistry from goit-pycore-hw-04/hw4/main.py, keep them identical
+    def __init__(self):
+        self.commands = {}
+
+    def register(self, names, handler, nargs=None, usage=None, stop=False):
+        if nargs is None:
+            low, high = 0, None
+        elif isinstance(nargs, int):
+            low = high = nargs
+        else:
+            low, high = nargs
+        entry = (handler, low, high, usage, stop)
+        for name in [names] if isinstance(names, str) else names:
+            self.commands[name.lower()] = entry
+
+    def dispatch(self, command, args, context):
+        if not command:
+            return None, False
+        entry = self.commands.get(command.lower())
+        if entry is None:
+            return "Invalid command.", False
+        handler, low, high, usage, stop = entry
+        if len(args) < low or (high is not None and len(args) > high):
+            return usage or "Invalid command.", False
+        return handler(args, context), stop
+
+
+commands = CommandRegistry()
+commands.register(("close", "exit"), lambda args, contacts: "Good bye!", stop=True)
+commands.register("hello", lambda args, contacts: "How can I help you?")
+commands.register("add", add_contact, 2, "Give me name and phone please.")
+commands.register("change", change_contact, 2, "Give me name and phone please.")
+commands.register("phone", show_phone, 1, "Invalid input. Please check the command format.")
+commands.register("all", lambda args, contacts: show_all(contacts))
+
+
 def main():
     contacts = {}
     print("Welcome to the assistant bot!")
@@ -52,22 +89,11 @@ def main():
     while True:
         user_input = input("Enter a command: ").strip()
         command, args = parse_input(user_input)
-
-        if command in ["close", "exit"]:
-            print("Good bye!")
+        reply, stop = commands.dispatch(command, args, contacts)
+        if reply is not None:
+            print(reply)
+        if stop:
             break
-        elif command == "hello":
-            print("How can I help you?")
-        elif command == "add":
-            print(add_contact(args, contacts))
-        elif command == "change":
-            print(change_contact(args, contacts))
-        elif command == "phone":
-            print(show_phone(args, contacts))
-        elif command == "all":
-            print(show_all(contacts))
-        else:
-            print("Invalid command.")
 
 
 if __name__ == "__main__":
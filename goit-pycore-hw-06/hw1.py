@@ -25,17 +25,22 @@ class Record:
     def __init__(self, name):
         self.name = Name(name)  # Создаем объект Name для хранения имени
         self.phones = []  # Инициализируем список для хранения номеров телефонов
+        self.book = None  # Адресная книга, в которую добавлена запись
 
     def add_phone(self, phone_number):
         """Добавление нового телефона в запись."""
         phone = Phone(phone_number)  # Создаем объект Phone
         self.phones.append(phone)  # Добавляем его в список телефонов
+        if self.book is not None:
+            self.book.link_phone(phone.value, self)  # Обновляем индекс телефонов книги
 
     def remove_phone(self, phone_number):
         """Удаление телефона по номеру."""
         for phone in self.phones:
             if phone.value == phone_number:  # Сравниваем с value
                 self.phones.remove(phone)
+                if self.book is not None:
+                    self.book.unlink_phone(phone_number, self)
                 return f"Phone number {phone_number} removed."
         return f"Phone number {phone_number} not found."
 
@@ -44,6 +49,9 @@ class Record:
         for phone in self.phones:
             if phone.value == old_number:  # Сравниваем с value
                 phone.value = new_number  # Исправляем номер телефона
+                if self.book is not None:
+                    self.book.unlink_phone(old_number, self)
+                    self.book.link_phone(new_number, self)
                 return f"Phone number updated to {new_number}."
         return f"Phone number {old_number} not found."
 
@@ -60,22 +68,50 @@ class Record:
 
 class AddressBook(UserDict):
     """Класс для хранения всех записей в адресной книге."""
+
+    def __init__(self, *args, **kwargs):
+        self.phone_index = {}  # Номер телефона -> записи, которым он принадлежит
+        super().__init__(*args, **kwargs)
     
     def add_record(self, record):
         """Добавление записи в адресную книгу."""
+        if record.name.value in self.data:
+            self.delete(record.name.value)  # Убираем из индекса телефоны заменяемой записи
         self.data[record.name.value] = record  # Добавляем запись в словарь по имени контакта
+        record.book = self
+        for phone in record.phones:
+            self.link_phone(phone.value, record)
 
     def find(self, name):
         """Поиск записи по имени."""
         return self.data.get(name, None)  # Возвращаем запись по имени или None, если не найдено
 
+    def find_by_phone(self, phone_number):
+        """Поиск записей по номеру телефона."""
+        return list(self.phone_index.get(phone_number, ()))
+
     def delete(self, name):
         """Удаление записи по имени."""
         if name in self.data:
-            del self.data[name]  # Удаляем запись из словаря
+            record = self.data.pop(name)  # Удаляем запись из словаря
+            record.book = None
+            for phone in record.phones:
+                self.unlink_phone(phone.value, record)
             return f"Contact {name} has been removed."
         return f"Contact {name} not found."
 
+    def link_phone(self, phone_number, record):
+        """Добавление телефона записи в индекс."""
+        self.phone_index.setdefault(phone_number, []).append(record)
+
+    def unlink_phone(self, phone_number, record):
+        """Удаление телефона записи из индекса."""
+        owners = self.phone_index.get(phone_number, [])
+        if record in owners:
+            owners.remove(record)
+            if not owners:
+                del self.phone_index[phone_number]
+
 # Пример использования:
 
 # Создаем новую адресную книгу
@@ -108,5 +144,9 @@ if john:
 found_phone = john.find_phone("5555555555")
 print(f"Found phone: {found_phone}")  # Вывод: Found phone: 5555555555
 
+# Поиск владельца номера по всей книге
+for owner in book.find_by_phone("1112223333"):
+    print(f"Owner: {owner.name.value}")  # Вывод: Owner: John
+
 # Удаление записи Джейн
 print(book.delete("Jane"))
\ No newline at end of file
@@ -1,5 +1,5 @@
 from collections import UserDict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 class Field:
     """
@@ -51,6 +51,7 @@ class Record:
         self.name = Name(name)
         self.phones = []
         self.birthday = None
+        self.book = None  # Адресная книга, в которую добавлена запись
 
     def add_phone(self, phone_number):
         """Добавляет новый номер телефона."""
@@ -82,7 +83,10 @@ class Record:
     
     def add_birthday(self, birthday):
         """Добавляет день рождения контакта."""
+        previous = self.birthday
         self.birthday = Birthday(birthday)
+        if self.book is not None:
+            self.book.birthday_changed(self, previous)
     
     def __str__(self):
         phones = '; '.join(p.value for p in self.phones)
@@ -93,9 +97,18 @@ class AddressBook(UserDict):
     """
     Класс для управления адресной книгой. Наследуется от UserDict.
     """
+    def __init__(self, *args, **kwargs):
+        self.calendar = [set() for _ in range(366)]  # Имена контактов по дню рождения
+        super().__init__(*args, **kwargs)
+
     def add_record(self, record):
         """Добавляет новый контакт в адресную книгу."""
+        if record.name.value in self.data:
+            self.delete(record.name.value)
         self.data[record.name.value] = record
+        record.book = self
+        if record.birthday:
+            self.calendar[day_of_year(record.birthday.date)].add(record.name.value)
     
     def find(self, name):
         """Ищет контакт по имени."""
@@ -104,23 +117,44 @@ class AddressBook(UserDict):
     def delete(self, name):
         """Удаляет контакт по имени, если он есть в книге."""
         if name in self.data:
-            del self.data[name]
+            record = self.data.pop(name)
+            record.book = None
+            if record.birthday:
+                self.calendar[day_of_year(record.birthday.date)].discard(name)
+    
+    def birthday_changed(self, record, previous):
+        """Переносит контакт в календаре после изменения дня рождения."""
+        if previous is not None:
+            self.calendar[day_of_year(previous.date)].discard(record.name.value)
+        self.calendar[day_of_year(record.birthday.date)].add(record.name.value)
     
-    def get_upcoming_birthdays(self):
-        """Возвращает список контактов, у которых день рождения на следующей неделе."""
+    def get_upcoming_birthdays(self, days=7):
+        """
+        Возвращает список контактов, у которых день рождения в ближайшие days дней включительно.
+        Просматриваются только эти дни календаря, а не вся книга.
+        """
         upcoming_birthdays = []
         today = datetime.today().date()
-        next_week = today + timedelta(days=7)
-        
-        for record in self.data.values():
-            if record.birthday:
-                birthday_date = record.birthday.date.replace(year=today.year)
-                if today <= birthday_date <= next_week:
-                    upcoming_birthdays.append(record.name.value)
+        for offset in range(days + 1):
+            day = today + timedelta(days=offset)
+            names = self.calendar[day_of_year(day)]
+            if day.month == 2 and day.day == 28 and not is_leap_year(day.year):
+                names = names | self.calendar[day_of_year(date(2000, 2, 29))]  # 29 февраля празднуем 28-го
+            upcoming_birthdays.extend(sorted(names))
         
         return upcoming_birthdays
 
 
+_MONTH_OFFSETS = [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335]  # Начало месяца в високосном году
+
+def day_of_year(day):
+    """Номер дня в високосном году (0-365), чтобы у каждой пары месяц/день была своя корзина."""
+    return _MONTH_OFFSETS[day.month - 1] + day.day - 1
+
+def is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
 # Создаем адресную книгу
 book = AddressBook()
 
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from collections import UserDict
 
 def input_error(func):
@@ -49,6 +49,7 @@ class Record:
         self.name = Name(name)
         self.phones = []
         self.birthday = None
+        self.book = None  # Адресная книга, в которую добавлена запись
     
     def add_phone(self, phone_number):
         self.phones.append(Phone(phone_number))
@@ -64,7 +65,10 @@ class Record:
         raise ValueError("Phone number not found.")
     
     def add_birthday(self, birthday):
+        previous = self.birthday
         self.birthday = Birthday(birthday)
+        if self.book is not None:
+            self.book.birthday_changed(self, previous)
     
     def show_birthday(self):
         return self.birthday.value.strftime("%d.%m.%Y") if self.birthday else "No birthday set."
@@ -76,28 +80,65 @@ class Record:
 
 class AddressBook(UserDict):
     """Класс для управления контактами."""
+    def __init__(self, *args, **kwargs):
+        self.calendar = [set() for _ in range(366)]  # Имена контактов по дню рождения
+        super().__init__(*args, **kwargs)
+    
     def add_record(self, record):
+        if record.name.value in self.data:
+            self.delete(record.name.value)
         self.data[record.name.value] = record
+        record.book = self
+        if record.birthday:
+            self.calendar[day_of_year(record.birthday.value)].add(record.name.value)
     
     def find(self, name):
         return self.data.get(name, None)
     
     def delete(self, name):
         if name in self.data:
-            del self.data[name]
+            record = self.data.pop(name)
+            record.book = None
+            if record.birthday:
+                self.calendar[day_of_year(record.birthday.value)].discard(name)
+    
+    def birthday_changed(self, record, previous):
+        """Переносит контакт в календаре после изменения дня рождения."""
+        if previous is not None:
+            self.calendar[day_of_year(previous.value)].discard(record.name.value)
+        self.calendar[day_of_year(record.birthday.value)].add(record.name.value)
     
-    def get_upcoming_birthdays(self):
+    def get_upcoming_birthdays(self, days=7):
+        """Возвращает поздравления на ближайшие days дней, просматривая только эти дни календаря."""
         today = datetime.today().date()
         upcoming = []
-        for record in self.data.values():
-            if record.birthday:
-                birthday = record.birthday.value.replace(year=today.year)
-                if birthday < today:
-                    birthday = birthday.replace(year=today.year + 1)
-                if 0 <= (birthday - today).days < 7:
-                    upcoming.append(f"{record.name.value}: {record.show_birthday()}")
+        for offset in range(days):
+            day = today + timedelta(days=offset)
+            names = self.calendar[day_of_year(day)]
+            if day.month == 2 and day.day == 28 and not is_leap_year(day.year):
+                names = names | self.calendar[day_of_year(date(2000, 2, 29))]  # 29 февраля празднуем 28-го
+            if names:
+                congratulation = move_from_weekend(day).strftime("%d.%m.%Y")
+                upcoming.extend(f"{name}: {congratulation}" for name in sorted(names))
         return upcoming if upcoming else ["No upcoming birthdays."]
 
+_MONTH_OFFSETS = [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335]  # Начало месяца в високосном году
+
+def day_of_year(day):
+    """Номер дня в високосном году (0-365), чтобы у каждой пары месяц/день была своя корзина."""
+    return _MONTH_OFFSETS[day.month - 1] + day.day - 1
+
+def is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+def move_from_weekend(day):
+    """Переносит поздравление с субботы или воскресенья на понедельник."""
+    if day.weekday() == 5:
+        return day + timedelta(days=2)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
 @input_error
 def add_birthday(args, book):
     name, date = args
@@ -113,9 +154,16 @@ def show_birthday(args, book):
     record = book.find(name)
     return record.show_birthday() if record else "Contact not found."
 
+MAX_BIRTHDAY_DAYS = 366  # Больший период только повторяет те же дни года
+
 @input_error
-def birthdays(_, book):
-    return "\n".join(book.get_upcoming_birthdays())
+def birthdays(args, book):
+    if args and not args[0].isdigit():
+        raise ValueError("Number of days must be a positive integer.")
+    days = int(args[0]) if args else 7
+    if days > MAX_BIRTHDAY_DAYS:
+        raise ValueError(f"Number of days must be at most {MAX_BIRTHDAY_DAYS}.")
+    return "\n".join(book.get_upcoming_birthdays(days))
 
 @input_error
 def add(args, book):
@@ -151,32 +199,59 @@ def change(args, book):
         return result
     return "Contact not found."
 
+def parse_input(user_input):
+    """Разбивает ввод на команду и аргументы; пустой ввод даёт пустую команду."""
+    command, *args = user_input.split() or [""]
+    return command.lower(), args
+
+class CommandRegistry:
+    """Копия CommandRegistry из goit-pycore-hw-04/hw4/main.py, должна оставаться идентичной ей."""
+    def __init__(self):
+        self.commands = {}
+
+    def register(self, names, handler, nargs=None, usage=None, stop=False):
+        if nargs is None:
+            low, high = 0, None
+        elif isinstance(nargs, int):
+            low = high = nargs
+        else:
+            low, high = nargs
+        entry = (handler, low, high, usage, stop)
+        for name in [names] if isinstance(names, str) else names:
+            self.commands[name.lower()] = entry
+
+    def dispatch(self, command, args, context):
+        if not command:
+            return None, False
+        entry = self.commands.get(command.lower())
+        if entry is None:
+            return "Invalid command.", False
+        handler, low, high, usage, stop = entry
+        if len(args) < low or (high is not None and len(args) > high):
+            return usage or "Invalid command.", False
+        return handler(args, context), stop
+
+commands = CommandRegistry()
+commands.register(("close", "exit"), lambda args, book: "Good bye!", stop=True)
+commands.register("hello", lambda args, book: "How can I help you?")
+commands.register("add", add, 2, "Usage: add [name] [phone]")
+commands.register("phone", phone, 1, "Usage: phone [name]")
+commands.register("change", change, 3, "Usage: change [name] [old phone] [new phone]")
+commands.register("add-birthday", add_birthday, 2, "Usage: add-birthday [name] [DD.MM.YYYY]")
+commands.register("show-birthday", show_birthday, 1, "Usage: show-birthday [name]")
+commands.register("birthdays", birthdays, (0, 1), "Usage: birthdays [days]")
+
 def main():
     book = AddressBook()
     print("Welcome to the assistant bot!")
     while True:
         user_input = input("Enter a command: ")
-        command, *args = user_input.split()
-
-        if command in ["close", "exit"]:
-            print("Good bye!")
+        command, args = parse_input(user_input)
+        reply, stop = commands.dispatch(command, args, book)
+        if reply is not None:
+            print(reply)
+        if stop:
             break
-        elif command == "hello":
-            print("How can I help you?")
-        elif command == "add":
-            print(add(args, book))
-        elif command == "phone":
-            print(phone(args, book))
-        elif command == "change":
-            print(change(args, book))
-        elif command == "add-birthday":
-            print(add_birthday(args, book))
-        elif command == "show-birthday":
-            print(show_birthday(args, book))
-        elif command == "birthdays":
-            print(birthdays(args, book))
-        else:
-            print("Invalid command.")
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,19 @@
+import argparse
+import heapq
+import json
+import mmap
+import os
 import pickle
-from datetime import datetime, timedelta
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, insort
+from itertools import chain
+from datetime import date, datetime, timedelta
 from collections import UserDict
+from collections.abc import MutableMapping
+from contextlib import nullcontext
 
 def input_error(func):
     """Декоратор для обробки помилок вводу."""
@@ -15,22 +28,34 @@ def input_error(func):
             return "Error: Contact not found."
     return wrapper
 
+# Класи полів і запису використовують __slots__, а телефони запису зберігаються
+# як 64-бітні числа в array: для великої книги більшість пам'яті йшла на накладні
+# витрати окремих об'єктів, а не на самі дані.
+
 class Field:
     """Базовий клас для полів запису."""
+    __slots__ = ("value",)
     def __init__(self, value):
         self.value = value
     def __str__(self):
         return str(self.value)
+    def __setstate__(self, state):
+        # Старі знімки pickle зберігали поля у __dict__
+        if isinstance(state, tuple):
+            state = state[1]
+        self.value = state["value"]
 
 class Name(Field):
     """Клас для зберігання імені контакту."""
+    __slots__ = ()
     def __init__(self, name):
         if not name.strip():
             raise ValueError("Name cannot be empty.")
-        super().__init__(name)
+        super().__init__(sys.intern(name))
 
 class Phone(Field):
     """Клас для зберігання та валідації номера телефону."""
+    __slots__ = ()
     def __init__(self, number):
         if not number.isdigit() or len(number) != 10:
             raise ValueError("Phone number must be 10 digits.")
@@ -38,81 +63,717 @@ class Phone(Field):
 
 class Birthday(Field):
     """Клас для зберігання та валідації дня народження."""
+    __slots__ = ()
     def __init__(self, value):
         try:
             self.value = datetime.strptime(value, "%d.%m.%Y").date()
         except ValueError:
             raise ValueError("Invalid date format. Use DD.MM.YYYY")
 
+    @classmethod
+    def from_date(cls, day):
+        """Створює день народження з уже перевіреної дати, без розбору рядка."""
+        birthday = cls.__new__(cls)
+        birthday.value = day
+        return birthday
+
 class Record:
     """Клас для зберігання інформації про контакт."""
+    __slots__ = ("name", "_phones", "birthday", "book")
+
     def __init__(self, name):
         self.name = Name(name)
-        self.phones = []
+        self._phones = array("Q")  # Номери телефонів як числа
         self.birthday = None
+        self.book = None  # Адресна книга, до якої додано запис
+    
+    def __setstate__(self, state):
+        # Старі знімки pickle зберігали запис у __dict__ зі списком об'єктів Phone
+        if isinstance(state, tuple):
+            state = state[1]
+        self.name = state["name"]
+        self._phones = state.get("_phones") or array("Q", (int(p.value) for p in state.get("phones", ())))
+        self.birthday = state["birthday"]
+        self.book = state.get("book")
+    
+    @property
+    def phones(self):
+        """Телефони запису як об'єкти Phone."""
+        return [Phone(f"{number:010d}") for number in self._phones]
+    
+    def numbers(self):
+        """Номери телефонів запису як числа."""
+        return self._phones
+    
+    def has_phone(self, phone_number):
+        # Лише повний номер з 10 цифр: "123" не повинен збігатися з 0000000123
+        return (len(phone_number) == 10 and phone_number.isascii() and phone_number.isdigit()
+                and int(phone_number) in self._phones)
+    
+    def _changed(self, op, *args, previous=None):
+        """Повідомляє адресну книгу про зміну запису."""
+        if self.book is not None:
+            self.book.record_changed(op, self.name.value, *args, previous=previous)
     
     def add_phone(self, phone_number):
-        self.phones.append(Phone(phone_number))
+        self._phones.append(int(Phone(phone_number).value))
+        self._changed("phone", phone_number)
     
     def remove_phone(self, phone_number):
-        self.phones = [phone for phone in self.phones if phone.value != phone_number]
+        if self.has_phone(phone_number):
+            number = int(phone_number)
+            self._phones = array("Q", (n for n in self._phones if n != number))
+            self._changed("remove", phone_number)
     
     def edit_phone(self, old_number, new_number):
-        for phone in self.phones:
-            if phone.value == old_number:
-                phone.value = new_number
-                return
+        if self.has_phone(old_number):
+            self._phones[self._phones.index(int(old_number))] = int(Phone(new_number).value)
+            self._changed("edit", old_number, new_number)
+            return
         raise ValueError("Phone number not found.")
     
     def add_birthday(self, birthday):
+        previous = self.birthday
         self.birthday = Birthday(birthday)
+        self._changed("birthday", birthday, previous=previous)
     
     def show_birthday(self):
         return self.birthday.value.strftime("%d.%m.%Y") if self.birthday else "No birthday set."
     
     def __str__(self):
-        phones = ", ".join(p.value for p in self.phones)
+        phones = ", ".join(f"{number:010d}" for number in self._phones)
         birthday = f", Birthday: {self.show_birthday()}" if self.birthday else ""
         return f"{self.name.value}: {phones}{birthday}"
+    
+    def summary(self):
+        """Повертає день народження (порядковий номер дати або 0) і номери телефонів як числа."""
+        birthday = self.birthday.value.toordinal() if self.birthday else 0
+        return birthday, self._phones
+    
+    def to_bytes(self):
+        """Кодує телефони та день народження запису для бінарного знімка."""
+        birthday, phones = self.summary()
+        if sys.byteorder == "big":
+            phones = array("Q", phones)
+            phones.byteswap()
+        return _RECORD_HEADER.pack(birthday, len(phones)) + phones.tobytes()
+    
+    @classmethod
+    def from_bytes(cls, name, raw):
+        """Відновлює запис з бінарного знімка."""
+        birthday, count = _RECORD_HEADER.unpack_from(raw)
+        record = cls(name)
+        record._phones.frombytes(raw[_RECORD_HEADER.size:_RECORD_HEADER.size + 8 * count])
+        if sys.byteorder == "big":
+            record._phones.byteswap()
+        if birthday:
+            record.birthday = Birthday.from_date(date.fromordinal(birthday))
+        return record
 
 class AddressBook(UserDict):
     """Клас для управління контактами."""
+    def __init__(self, *args, **kwargs):
+        self.journal = None  # Журнал змін, під'єднується функцією load_data
+        self.generation = 0  # Номер знімка, до якого відноситься журнал
+        self._phones = None  # Номер телефону -> ім'я власника або кортеж імен; будується при першому пошуку
+        self._calendar = None  # 366 множин імен за днем народження; будується при першому запиті
+        self._names = None  # Пошуковий індекс імен; будується при першому пошуку
+        super().__init__(*args, **kwargs)
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["journal"] = None  # Відкритий файл журналу не серіалізується
+        return state
+    
     def add_record(self, record):
-        self.data[record.name.value] = record
+        name = record.name.value
+        if self._phones is not None or self._calendar is not None:
+            if name in self.data:
+                self._unindex(self.data[name])
+            self._index(record)
+        if self._names is not None and name not in self.data:
+            self._names.add(name)
+        loaded = self.data.loaded if isinstance(self.data, LazyRecords) else self.data
+        replaced = loaded.get(name)
+        if replaced is not None and replaced is not record:
+            replaced.book = None  # Замінений запис більше не пише зміни в журнал, як і після delete
+        record.book = self
+        self.data[name] = record
+        birthday = record.show_birthday() if record.birthday else None
+        self.record_changed("record", record.name.value, [f"{n:010d}" for n in record.numbers()], birthday)
     
     def find(self, name):
         return self.data.get(name, None)
     
+    def find_by_phone(self, phone_number):
+        """Повертає записи, яким належить номер телефону."""
+        owners = self._phone_index().get(int(Phone(phone_number).value), ())
+        if isinstance(owners, str):
+            owners = (owners,)
+        return [self.data[name] for name in owners]
+    
+    def search(self, prefix, limit=10):
+        """Повертає до limit записів, ім'я яких починається з prefix (без урахування регістру)."""
+        return [self.data[name] for name in self._name_index().prefix(prefix, limit)]
+    
+    def fuzzy_search(self, name, max_distance=2, limit=5):
+        """Повертає до limit записів з іменами, найближчими до name за відстанню редагування."""
+        return [self.data[found] for found in self._name_index().fuzzy(name, max_distance, limit)]
+    
+    def _name_index(self):
+        if self._names is None:
+            self._names = NameIndex(self.data)
+        return self._names
+    
     def delete(self, name):
         if name in self.data:
-            del self.data[name]
+            record = self.data.pop(name)
+            record.book = None
+            self._unindex(record)
+            if self._names is not None:
+                self._names.remove(name)
+            self.record_changed("delete", name)
+    
+    def _phone_index(self):
+        if self._phones is None:
+            self._phones = {}
+            for name, _, phones in self._scan():
+                for number in phones:
+                    self._link_phone(number, name)
+        return self._phones
+    
+    def _scan(self):
+        """Ім'я, день народження і телефони кожного запису; записи знімка при цьому не декодуються."""
+        if isinstance(self.data, LazyRecords):
+            yield from self.data.scan()
+        else:
+            for name, record in self.data.items():
+                yield name, *record.summary()
+    
+    def _link_phone(self, number, name):
+        owners = self._phones.get(number)
+        if owners is None:
+            self._phones[number] = name
+        elif isinstance(owners, str):
+            if owners != name:
+                self._phones[number] = (owners, name)
+        elif name not in owners:
+            self._phones[number] = owners + (name,)
     
-    def get_upcoming_birthdays(self):
+    def _unlink_phone(self, number, name):
+        owners = self._phones.get(number)
+        if owners == name:
+            del self._phones[number]
+        elif isinstance(owners, tuple) and name in owners:
+            owners = tuple(owner for owner in owners if owner != name)
+            self._phones[number] = owners[0] if len(owners) == 1 else owners
+    
+    def _birthday_calendar(self):
+        if self._calendar is None:
+            self._calendar = [set() for _ in range(366)]
+            for name, birthday, _ in self._scan():
+                if birthday:
+                    self._calendar[day_of_year(date.fromordinal(birthday))].add(name)
+        return self._calendar
+    
+    def _index(self, record):
+        """Додає телефони і день народження запису до побудованих індексів."""
+        name = record.name.value
+        if self._phones is not None:
+            for number in record.numbers():
+                self._link_phone(number, name)
+        if self._calendar is not None and record.birthday:
+            self._calendar[day_of_year(record.birthday.value)].add(name)
+    
+    def _unindex(self, record):
+        """Прибирає телефони і день народження запису з побудованих індексів."""
+        name = record.name.value
+        if self._phones is not None:
+            for number in record.numbers():
+                self._unlink_phone(number, name)
+        if self._calendar is not None and record.birthday:
+            self._calendar[day_of_year(record.birthday.value)].discard(name)
+    
+    def record_changed(self, op, name, *args, previous=None):
+        """Оновлює індекси і журнал після зміни запису; previous - попереднє значення поля."""
+        if self._phones is not None and op in ("phone", "remove", "edit"):
+            if op != "phone" and not self.data[name].has_phone(args[0]):
+                self._unlink_phone(int(args[0]), name)
+            if op != "remove":
+                self._link_phone(int(args[-1]), name)
+        if self._calendar is not None and op == "birthday":
+            if previous is not None:
+                self._calendar[day_of_year(previous.value)].discard(name)
+            self._calendar[day_of_year(self.data[name].birthday.value)].add(name)
+        if self.journal is None:
+            return
+        self.journal.append(op, name, *args)
+        if not self.journal.buffered and self.journal.needs_compaction(len(self.data)):
+            self.journal.compact(self)
+    
+    def get_upcoming_birthdays(self, days=7):
+        """
+        Повертає привітання на найближчі days днів, починаючи з сьогодні.
+        Переглядаються лише відповідні дні календаря, а не вся книга.
+        """
+        calendar = self._birthday_calendar()
         today = datetime.today().date()
         upcoming = []
-        for record in self.data.values():
-            if record.birthday:
-                birthday = record.birthday.value.replace(year=today.year)
-                if birthday < today:
-                    birthday = birthday.replace(year=today.year + 1)
-                if 0 <= (birthday - today).days < 7:
-                    upcoming.append(f"{record.name.value}: {record.show_birthday()}")
+        for offset in range(days):
+            day = today + timedelta(days=offset)
+            names = calendar[day_of_year(day)]
+            if day.month == 2 and day.day == 28 and not is_leap_year(day.year):
+                names = names | calendar[day_of_year(date(2000, 2, 29))]  # 29 лютого святкуємо 28-го
+            if names:
+                congratulation = move_from_weekend(day).strftime("%d.%m.%Y")
+                upcoming.extend(f"{name}: {congratulation}" for name in sorted(names))
         return upcoming if upcoming else ["No upcoming birthdays."]
 
+# Пошук за іменем
+
+class NameIndex:
+    """
+    Пошуковий індекс імен без урахування регістру.
+    Відсортований список дає пошук за префіксом двійковим пошуком, а найрідкісніші
+    триграми запиту відбирають кандидатів для нечіткого пошуку.
+    """
+    def __init__(self, names=()):
+        self.sorted = []  # Пари (ім'я в нижньому регістрі, ім'я)
+        self.grams = {}  # Триграма -> множина імен
+        self.lengths = {}  # Довжина імені -> множина імен, для коротких запитів
+        for name in names:
+            self.sorted.append((name.casefold(), name))
+            self._link(name)
+        self.sorted.sort()
+
+    @staticmethod
+    def _trigrams(folded):
+        padded = f"  {folded}  "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _link(self, name):
+        folded = name.casefold()
+        for gram in self._trigrams(folded):
+            self.grams.setdefault(gram, set()).add(name)
+        self.lengths.setdefault(len(folded), set()).add(name)
+
+    def add(self, name):
+        insort(self.sorted, (name.casefold(), name))
+        self._link(name)
+
+    def remove(self, name):
+        folded = name.casefold()
+        i = bisect_left(self.sorted, (folded, name))
+        if i < len(self.sorted) and self.sorted[i] == (folded, name):
+            del self.sorted[i]
+        for gram in self._trigrams(folded):
+            self.grams[gram].discard(name)
+        self.lengths[len(folded)].discard(name)
+
+    def prefix(self, prefix, limit=10):
+        """Імена, що починаються з prefix, в алфавітному порядку."""
+        folded = prefix.casefold()
+        found = []
+        for i in range(bisect_left(self.sorted, (folded,)), len(self.sorted)):
+            key, name = self.sorted[i]
+            if len(found) == limit or not key.startswith(folded):
+                break
+            found.append(name)
+        return found
+
+    def fuzzy(self, query, max_distance=2, limit=5):
+        """До limit імен на відстані редагування не більше max_distance, найближчі першими."""
+        folded = query.casefold()
+        postings = sorted((self.grams.get(gram, set()) for gram in self._trigrams(folded)), key=len)
+        found = []
+        checked = set()
+        for distance in range(max_distance + 1):
+            # Кожна правка руйнує щонайбільше три триграми, тож ім'я на відстані distance
+            # містить хоча б одну з 3 * distance + 1 найрідкісніших триграм запиту
+            if 3 * distance < len(postings):
+                candidates = chain.from_iterable(postings[:3 * distance + 1])
+            else:
+                candidates = chain.from_iterable(self.lengths.get(length, ())
+                                                 for length in range(len(folded) - max_distance,
+                                                                     len(folded) + max_distance + 1))
+            for name in candidates:
+                if name not in checked:
+                    checked.add(name)
+                    found_distance = edit_distance(folded, name.casefold(), max_distance)
+                    if found_distance <= max_distance:
+                        found.append((found_distance, name))
+            # Усі імена на відстані до distance вже знайдено; якщо їх досить, далі можна не шукати
+            closest = [item for item in found if item[0] <= distance]
+            if len(closest) >= limit:
+                break
+        return [name for _, name in heapq.nsmallest(limit, found)]
+
+def edit_distance(first, second, limit):
+    """
+    Відстань Левенштейна, обчислена бітово-паралельним алгоритмом Маєрса.
+    Якщо відстань більша за limit, повертає limit + 1.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    if not first:
+        return len(second)
+    masks = {}
+    for i, char in enumerate(first):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << len(first)) - 1
+    top = 1 << (len(first) - 1)
+    plus, minus, distance = full, 0, len(first)
+    for char in second:
+        equal = masks.get(char, 0)
+        vertical = equal | minus
+        horizontal = (((equal & plus) + plus) ^ plus) | equal
+        plus_h = minus | ~(horizontal | plus) & full
+        minus_h = plus & horizontal
+        if plus_h & top:
+            distance += 1
+        elif minus_h & top:
+            distance -= 1
+        plus_h = (plus_h << 1) | 1
+        minus_h <<= 1
+        plus = (minus_h | ~(vertical | plus_h)) & full
+        minus = plus_h & vertical & full
+    return distance if distance <= limit else limit + 1
+
+# Календар днів народження
+
+_MONTH_OFFSETS = [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335]  # Початок місяця у високосному році
+
+def day_of_year(day):
+    """Номер дня у високосному році (0-365), щоб кожна пара місяць/день мала свій кошик."""
+    return _MONTH_OFFSETS[day.month - 1] + day.day - 1
+
+def is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+def move_from_weekend(day):
+    """Переносить привітання з суботи чи неділі на понеділок."""
+    if day.weekday() == 5:
+        return day + timedelta(days=2)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
 # Функції для серіалізації та десеріалізації
 
+# Бінарний знімок: заголовок, відсортований за іменем індекс, далі імена та записи.
+SNAPSHOT_MAGIC = b"ABOOK\x00\x00\x01"
+_HEADER = struct.Struct("<8sQQ")  # сигнатура, покоління, кількість записів
+_INDEX_ENTRY = struct.Struct("<QIQI")  # зсув і довжина імені, зсув і довжина запису
+_RECORD_HEADER = struct.Struct("<iH")  # день народження (порядковий номер дати або 0), кількість телефонів
+
+class SnapshotFile:
+    """Бінарний знімок адресної книги, відкритий через mmap."""
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.generation, self.count = _HEADER.unpack_from(self.mm)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{filename} is not an address book snapshot.")
+
+    def _entry(self, i):
+        return _INDEX_ENTRY.unpack_from(self.mm, _HEADER.size + i * _INDEX_ENTRY.size)
+
+    def name_at(self, i):
+        name_offset, name_length, _, _ = self._entry(i)
+        return self.mm[name_offset:name_offset + name_length]
+
+    def raw_at(self, i):
+        _, _, record_offset, record_length = self._entry(i)
+        return self.mm[record_offset:record_offset + record_length]
+
+    def locate(self, name):
+        """Двійковий пошук імені в індексі; повертає номер запису або -1."""
+        key = name.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.name_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.name_at(low) == key:
+            return low
+        return -1
+
+    def names(self):
+        for i in range(self.count):
+            yield self.name_at(i).decode("utf-8")
+
+    def close(self):
+        self.mm.close()
+
+    @staticmethod
+    def write(filename, generation, items, count):
+        """Записує знімок з пар (ім'я, закодований запис); count - кількість пар."""
+        index = []
+        with open(filename, "wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, generation, count))
+            offset = _HEADER.size + count * _INDEX_ENTRY.size
+            f.seek(offset)
+            for name, raw in items:
+                key = name.encode("utf-8")
+                f.write(key)
+                f.write(raw)
+                index.append((key, offset, len(key), offset + len(key), len(raw)))
+                offset += len(key) + len(raw)
+            index.sort()
+            f.seek(_HEADER.size)
+            f.write(b"".join(_INDEX_ENTRY.pack(*entry[1:]) for entry in index))
+
+class LazyRecords(MutableMapping):
+    """
+    Словник записів адресної книги поверх бінарного знімка.
+    Запис декодується з файлу лише при першому зверненні до нього.
+    """
+    def __init__(self, snapshot, book, loaded=None):
+        self.snapshot = snapshot
+        self.book = book
+        self.loaded = loaded if loaded is not None else {}  # Декодовані та нові записи
+        self.deleted = set()  # Імена зі знімка, видалені після завантаження
+        self.added = set()  # Імена, яких немає у знімку
+
+    def __getitem__(self, name):
+        record = self.loaded.get(name)
+        if record is not None:
+            return record
+        if name in self.deleted:
+            raise KeyError(name)
+        i = self.snapshot.locate(name)
+        if i < 0:
+            raise KeyError(name)
+        record = Record.from_bytes(name, self.snapshot.raw_at(i))
+        record.book = self.book
+        self.loaded[name] = record
+        return record
+
+    def __contains__(self, name):
+        if name in self.loaded:
+            return True
+        return name not in self.deleted and self.snapshot.locate(name) >= 0
+
+    def __setitem__(self, name, record):
+        if name not in self:
+            if self.snapshot.locate(name) < 0:
+                self.added.add(name)
+            else:
+                self.deleted.discard(name)
+        self.loaded[name] = record
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self.loaded.pop(name, None)
+        if name in self.added:
+            self.added.remove(name)
+        else:
+            self.deleted.add(name)
+
+    def __iter__(self):
+        for name in self.snapshot.names():
+            if name not in self.deleted:
+                yield name
+        yield from self.added
+
+    def __len__(self):
+        return self.snapshot.count - len(self.deleted) + len(self.added)
+
+    def scan(self):
+        """Ім'я, день народження і телефони кожного запису без створення об'єктів Record."""
+        for i in range(self.snapshot.count):
+            name = self.snapshot.name_at(i).decode("utf-8")
+            if name not in self.deleted and name not in self.loaded:
+                raw = self.snapshot.raw_at(i)
+                birthday, count = _RECORD_HEADER.unpack_from(raw)
+                yield name, birthday, struct.unpack_from(f"<{count}Q", raw, _RECORD_HEADER.size)
+        for name, record in self.loaded.items():
+            yield name, *record.summary()
+
+    def raw_items(self):
+        """Пари (ім'я, закодований запис); незмінені записи копіюються зі знімка без декодування."""
+        for i in range(self.snapshot.count):
+            name = self.snapshot.name_at(i).decode("utf-8")
+            if name not in self.deleted and name not in self.loaded:
+                yield name, self.snapshot.raw_at(i)
+        for name, record in self.loaded.items():
+            yield name, record.to_bytes()
+
+    def rebase(self, snapshot):
+        """Переходить на новий знімок, який уже містить усі зміни."""
+        self.snapshot = snapshot
+        self.deleted.clear()
+        self.added.clear()
+
+class Journal:
+    """
+    Журнал змін адресної книги. Кожна зміна дописується в кінець файлу одним рядком JSON,
+    тож збереження коштує пропорційно кількості змін, а не розміру книги.
+    Перший рядок журналу містить номер покоління знімка, до якого відносяться зміни.
+    """
+    def __init__(self, filename, compact_every=1000):
+        self.filename = os.path.splitext(filename)[0] + ".journal"
+        self.snapshot = filename
+        self.compact_every = compact_every  # Мінімальна кількість змін до ущільнення
+        self.entries = 0
+        self.file = None
+        self.buffered = False  # Пакетний режим: без flush після кожної зміни, ущільнення лише в save_data
+
+    def open(self, book):
+        """Відтворює в книзі зміни з журналу та відкриває журнал для дописування."""
+        good_size = 0
+        try:
+            with open(self.filename, "rb") as f:
+                header = f.readline()
+                if header.endswith(b"\n") and json.loads(header) == ["generation", book.generation]:
+                    good_size = len(header)
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break  # Обірваний рядок після аварійного завершення
+                        op, name, *args = json.loads(line)
+                        self._apply(book, op, name, args)
+                        good_size += len(line)
+                        self.entries += 1
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            pass  # Пошкоджений хвіст журналу відкидається
+        if good_size:
+            with open(self.filename, "r+b") as f:
+                f.truncate(good_size)
+            self.file = open(self.filename, "a", encoding="utf-8")
+        else:
+            self._start(book.generation)
+
+    @staticmethod
+    def _apply(book, op, name, args):
+        if op == "record":
+            phones, birthday = args
+            record = Record(name)
+            for number in phones:
+                record.add_phone(number)
+            if birthday:
+                record.add_birthday(birthday)
+            book.add_record(record)
+        elif op == "delete":
+            book.delete(name)
+        elif op == "phone":
+            book.find(name).add_phone(*args)
+        elif op == "remove":
+            book.find(name).remove_phone(*args)
+        elif op == "edit":
+            book.find(name).edit_phone(*args)
+        elif op == "birthday":
+            book.find(name).add_birthday(*args)
+
+    def _start(self, generation):
+        """Починає порожній журнал для знімка вказаного покоління."""
+        self.close()
+        self.file = open(self.filename, "w", encoding="utf-8")
+        self.entries = 0
+        self._write(["generation", generation])
+
+    def _write(self, entry):
+        if self.file is None:
+            self.file = open(self.filename, "a", encoding="utf-8")
+        self.file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        if not self.buffered:
+            self.file.flush()
+
+    def append(self, op, name, *args):
+        """Дописує одну зміну в журнал."""
+        self._write([op, name, *args])
+        self.entries += 1
+
+    def needs_compaction(self, book_size):
+        return self.entries >= max(self.compact_every, book_size)
+
+    def compact(self, book):
+        """Записує новий знімок книги і починає порожній журнал нового покоління."""
+        book.generation += 1
+        if isinstance(book.data, LazyRecords):
+            items = book.data.raw_items()
+        else:
+            items = ((name, record.to_bytes()) for name, record in book.data.items())
+        tmp_filename = self.snapshot + ".tmp"
+        SnapshotFile.write(tmp_filename, book.generation, items, len(book.data))
+        if isinstance(book.data, LazyRecords):
+            book.data.snapshot.close()  # Windows не дозволяє замінити відображений у пам'ять файл
+        os.replace(tmp_filename, self.snapshot)
+        snapshot = SnapshotFile(self.snapshot)
+        if isinstance(book.data, LazyRecords):
+            book.data.rebase(snapshot)
+        else:
+            book.data = LazyRecords(snapshot, book, book.data)
+        self._start(book.generation)
+
+    def flush(self):
+        """Записує на диск зміни, накопичені в буферизованому режимі."""
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
 def save_data(book, filename="addressbook.pkl"):
-    """Зберігає дані адресної книги у файл."""
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
+    """Зберігає дані адресної книги: закриває журнал, а знімок перезаписує лише під час ущільнення."""
+    journal = book.journal
+    if journal is None or journal.snapshot != filename:
+        # Книга переходить до нового файлу: його журнал замінює старий
+        if journal is not None:
+            journal.close()
+        journal = Journal(filename)
+        journal.buffered = book.journal is not None and book.journal.buffered
+        journal.compact(book)
+        book.journal = journal
+    elif journal.needs_compaction(len(book)):
+        journal.compact(book)
+    journal.close()
+
+class _LegacyUnpickler(pickle.Unpickler):
+    """Старі знімки посилаються на класи з __main__, бо записувалися під час запуску скрипта."""
+    def find_class(self, module, name):
+        if module == "__main__" and name in ("AddressBook", "Record", "Field", "Name", "Phone", "Birthday"):
+            return globals()[name]
+        return super().find_class(module, name)
+
+def _load_pickle(f):
+    """Читає адресну книгу, збережену старими версіями через pickle."""
+    legacy = _LegacyUnpickler(f).load()
+    book = AddressBook()
+    book.generation = getattr(legacy, "generation", 0)
+    book.data = legacy.data
+    for record in book.data.values():
+        record.book = book
+    return book
 
 def load_data(filename="addressbook.pkl"):
-    """Завантажує дані адресної книги з файлу, або повертає нову книгу, якщо файл не знайдено."""
+    """
+    Відкриває знімок адресної книги та відтворює журнал змін, або повертає нову книгу, якщо файл не знайдено.
+    Записи зі знімка декодуються лише тоді, коли до них звертаються.
+    """
+    book = AddressBook()  # Повернення нової адресної книги, якщо файл не знайдено
     try:
         with open(filename, "rb") as f:
-            return pickle.load(f)
+            legacy = f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC
+            if legacy:
+                f.seek(0)
+                book = _load_pickle(f)
+        if not legacy:
+            snapshot = SnapshotFile(filename)
+            book.generation = snapshot.generation
+            book.data = LazyRecords(snapshot, book)
     except FileNotFoundError:
-        return AddressBook()  # Повернення нової адресної книги, якщо файл не знайдено
+        pass
+    journal = Journal(filename)
+    journal.open(book)
+    book.journal = journal
+    return book
 
 # Обробка команд
 
@@ -131,9 +792,16 @@ def show_birthday(args, book):
     record = book.find(name)
     return record.show_birthday() if record else "Contact not found."
 
+MAX_BIRTHDAY_DAYS = 366  # Більший період лише повторює ті самі дні року
+
 @input_error
-def birthdays(_, book):
-    return "\n".join(book.get_upcoming_birthdays())
+def birthdays(args, book):
+    if args and not args[0].isdigit():
+        raise ValueError("Number of days must be a positive integer.")
+    days = int(args[0]) if args else 7
+    if days > MAX_BIRTHDAY_DAYS:
+        raise ValueError(f"Number of days must be at most {MAX_BIRTHDAY_DAYS}.")
+    return "\n".join(book.get_upcoming_birthdays(days))
 
 @input_error
 def add(args, book):
@@ -169,6 +837,137 @@ def change(args, book):
         return result
     return "Contact not found."
 
+@input_error
+def find_phone(args, book):
+    """Показує, кому належить номер телефону."""
+    number = args[0]
+    records = book.find_by_phone(number)
+    if records:
+        return f"{number}: " + ", ".join(record.name.value for record in records)
+    return "Contact not found."
+
+@input_error
+def search(args, book):
+    """Шукає контакти за початком імені."""
+    records = book.search(args[0])
+    return "\n".join(str(record) for record in records) if records else "No contacts found."
+
+@input_error
+def fuzzy_search(args, book):
+    """Шукає контакти з іменем, схожим на вказане."""
+    records = book.fuzzy_search(args[0])
+    return "\n".join(str(record) for record in records) if records else "No contacts found."
+
+@input_error
+def delete(args, book):
+    """Видаляє контакт з адресної книги."""
+    name = args[0]
+    if book.find(name):
+        book.delete(name)
+        return f"Contact {name} deleted."
+    return "Contact not found."
+
+def close(args, book):
+    """Зберігає дані перед виходом."""
+    save_data(book)
+    return "Good bye!"
+
+# Таблиця команд
+
+def parse_input(user_input):
+    """Розбиває введення на команду та аргументи; порожнє введення дає порожню команду."""
+    command, *args = user_input.split() or [""]
+    return command.lower(), args
+
+class CommandRegistry:
+    """Копія CommandRegistry з goit-pycore-hw-04/hw4/main.py, має залишатися ідентичною їй."""
+    def __init__(self):
+        self.commands = {}
+
+    def register(self, names, handler, nargs=None, usage=None, stop=False):
+        if nargs is None:
+            low, high = 0, None
+        elif isinstance(nargs, int):
+            low = high = nargs
+        else:
+            low, high = nargs
+        entry = (handler, low, high, usage, stop)
+        for name in [names] if isinstance(names, str) else names:
+            self.commands[name.lower()] = entry
+
+    def dispatch(self, command, args, context):
+        if not command:
+            return None, False
+        entry = self.commands.get(command.lower())
+        if entry is None:
+            return "Invalid command.", False
+        handler, low, high, usage, stop = entry
+        if len(args) < low or (high is not None and len(args) > high):
+            return usage or "Invalid command.", False
+        return handler(args, context), stop
+
+commands = CommandRegistry()
+commands.register(("close", "exit"), close, stop=True)
+commands.register("hello", lambda args, book: "How can I help you?")
+commands.register("add", add, 2, "Usage: add [name] [phone]")
+commands.register("phone", phone, 1, "Usage: phone [name]")
+commands.register("change", change, 3, "Usage: change [name] [old phone] [new phone]")
+commands.register("search", search, 1, "Usage: search [name prefix]")
+commands.register("search~", fuzzy_search, 1, "Usage: search~ [name]")
+commands.register("find-phone", find_phone, 1, "Usage: find-phone [phone]")
+commands.register("delete", delete, 1, "Usage: delete [name]")
+commands.register("add-birthday", add_birthday, 2, "Usage: add-birthday [name] [DD.MM.YYYY]")
+commands.register("show-birthday", show_birthday, 1, "Usage: show-birthday [name]")
+commands.register("birthdays", birthdays, (0, 1), "Usage: birthdays [days]")
+
+# Пакетний режим
+
+ERROR_REPLIES = ("Error:", "Usage:", "Invalid command.", "Contact not found.")  # Відповіді, що вважаються помилками
+OUTPUT_LINES = 10000  # Скільки відповідей накопичується перед записом у stdout
+
+def run_batch(lines, book, out, errors):
+    """
+    Виконує команди з рядків lines без input і print: відповіді накопичуються й виводяться
+    в out пачками, помилки пишуться в errors з номером рядка. Повертає (кількість команд, кількість помилок).
+    """
+    replies = []
+    count = failed = 0
+    for line_number, line in enumerate(lines, 1):
+        command, args = parse_input(line)
+        if not command:
+            continue
+        reply, stop = commands.dispatch(command, args, book)
+        count += 1
+        if reply is not None and reply.startswith(ERROR_REPLIES):
+            failed += 1
+            errors.write(f"line {line_number}: {reply}\n")
+        elif reply is not None:
+            replies.append(reply)
+            if len(replies) >= OUTPUT_LINES:
+                out.write("\n".join(replies) + "\n")
+                replies.clear()
+        if stop:
+            break
+    if replies:
+        out.write("\n".join(replies) + "\n")
+    return count, failed
+
+def batch(source, filename="addressbook.pkl"):
+    """
+    Виконує команди з файлу source ("-" - зі stdin) над книгою filename. Журнал пишеться без flush
+    після кожної зміни, книга зберігається один раз наприкінці. Повертає код завершення: 1, якщо були помилки.
+    """
+    start = time.perf_counter()
+    book = load_data(filename)
+    book.journal.buffered = True
+    with nullcontext(sys.stdin) if source == "-" else open(source, encoding="utf-8") as lines:
+        count, failed = run_batch(lines, book, sys.stdout, sys.stderr)
+    save_data(book, filename)
+    elapsed = time.perf_counter() - start
+    sys.stdout.flush()
+    sys.stderr.write(f"{count} commands, {failed} errors in {elapsed:.2f}s ({count / elapsed:,.0f} commands/s)\n")
+    return 1 if failed else 0
+
 # Головна функція
 
 def main():
@@ -176,28 +975,17 @@ def main():
     print("Welcome to the assistant bot!")
     while True:
         user_input = input("Enter a command: ")
-        command, *args = user_input.split()
-
-        if command in ["close", "exit"]:
-            save_data(book)  # Збереження даних перед виходом
-            print("Good bye!")
+        command, args = parse_input(user_input)
+        reply, stop = commands.dispatch(command, args, book)
+        if reply is not None:
+            print(reply)
+        if stop:
             break
-        elif command == "hello":
-            print("How can I help you?")
-        elif command == "add":
-            print(add(args, book))
-        elif command == "phone":
-            print(phone(args, book))
-        elif command == "change":
-            print(change(args, book))
-        elif command == "add-birthday":
-            print(add_birthday(args, book))
-        elif command == "show-birthday":
-            print(show_birthday(args, book))
-        elif command == "birthdays":
-            print(birthdays(args, book))
-        else:
-            print("Invalid command.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бот-помічник з адресною книгою.")
+    parser.add_argument("--batch", metavar="FILE", help="виконати команди з файлу (- для stdin) без діалогу")
+    options = parser.parse_args()
+    if options.batch is not None or not sys.stdin.isatty():
+        sys.exit(batch(options.batch or "-"))
     main()
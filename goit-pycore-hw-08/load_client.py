@@ -0,0 +1,78 @@
+"""
+Генератор навантаження для server.py: відкриває багато з'єднань, надсилає команди конвеєром
+і виводить пропускну здатність та затримки p50/p99.
+
+    python load_client.py --connections 1000 --requests 200 --pipeline 10 --writes 0.1
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from server import raise_open_files_limit
+
+def percentile(values, share):
+    """Значення, меншим за яке є частка share відсортованих values."""
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+def make_commands(client, count, writes, rng):
+    """Команди одного клієнта: запис додає телефон власному контакту, читання шукає чужі."""
+    result = []
+    for i in range(count):
+        if rng.random() < writes or i == 0:
+            result.append(f"add load{client} {rng.randrange(10 ** 10):010d}")
+        else:
+            result.append(rng.choice((f"phone load{rng.randrange(client + 1)}", f"search load{client % 10}", "birthdays")))
+    return result
+
+async def read_reply(reader):
+    """Читає одну відповідь: рядок з кількістю рядків і самі рядки."""
+    count = int(await reader.readline())
+    return [await reader.readline() for _ in range(count)]
+
+async def run_client(host, port, client, options, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    pending = make_commands(client, options.requests, options.writes, rng)
+    for start in range(0, len(pending), options.pipeline):
+        window = pending[start:start + options.pipeline]
+        sent = time.perf_counter()
+        writer.write("".join(command + "\n" for command in window).encode("utf-8"))
+        await writer.drain()
+        for _ in window:
+            await read_reply(reader)
+            latencies.append(time.perf_counter() - sent)
+    writer.write(b"exit\n")
+    await read_reply(reader)
+    writer.close()
+
+async def run(options):
+    rng = random.Random(options.seed)
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_client(options.host, options.port, client, options, latencies, rng) for client in range(options.connections)),
+        return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failed = [error for error in results if isinstance(error, Exception)]
+    latencies.sort()
+    print(f"{options.connections} connections, {len(latencies)} requests in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} requests/s), {len(failed)} failed connections")
+    if latencies:
+        print(f"latency p50 {percentile(latencies, 0.50) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+    if failed:
+        print(f"first error: {failed[0]!r}", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Навантаження для сервера адресної книги.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=1000, help="кількість одночасних з'єднань")
+    parser.add_argument("--requests", type=int, default=100, help="команд на з'єднання")
+    parser.add_argument("--pipeline", type=int, default=10, help="команд, надісланих без очікування відповіді")
+    parser.add_argument("--writes", type=float, default=0.1, help="частка команд запису")
+    parser.add_argument("--seed", type=int, default=1)
+    options = parser.parse_args()
+    raise_open_files_limit()
+    sys.exit(asyncio.run(run(options)))
@@ -0,0 +1,75 @@
+"""
+Порівнює пам'ять на один контакт для попереднього представлення запису
+(об'єкти з __dict__ і список об'єктів Phone) та компактного представлення з hw1.
+
+Запуск: python memory_benchmark.py [кількість контактів]
+"""
+import sys
+import tracemalloc
+from datetime import datetime
+
+from hw1 import AddressBook, Record
+
+
+# Попереднє представлення запису, відтворене для порівняння
+
+class LegacyField:
+    def __init__(self, value):
+        self.value = value
+
+class LegacyPhone(LegacyField):
+    pass
+
+class LegacyBirthday(LegacyField):
+    def __init__(self, value):
+        super().__init__(datetime.strptime(value, "%d.%m.%Y").date())
+
+class LegacyRecord:
+    def __init__(self, name):
+        self.name = LegacyField(name)
+        self.phones = []
+        self.birthday = None
+
+
+def contact(i):
+    """Ім'я, два телефони і день народження i-го тестового контакту."""
+    return f"Contact{i}", f"{i:010d}", f"{i + 1:010d}", f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.1990"
+
+def build_legacy(count):
+    book = {}
+    for i in range(count):
+        name, first, second, birthday = contact(i)
+        record = LegacyRecord(name)
+        record.phones.append(LegacyPhone(first))
+        record.phones.append(LegacyPhone(second))
+        record.birthday = LegacyBirthday(birthday)
+        book[name] = record
+    return book
+
+def build_compact(count):
+    book = AddressBook()
+    for i in range(count):
+        name, first, second, birthday = contact(i)
+        record = Record(name)
+        record.add_phone(first)
+        record.add_phone(second)
+        record.add_birthday(birthday)
+        book.add_record(record)
+    return book
+
+def bytes_per_contact(build, count):
+    tracemalloc.start()
+    book = build(count)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del book
+    return used / count
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    legacy = bytes_per_contact(build_legacy, count)
+    compact = bytes_per_contact(build_compact, count)
+    print(f"Contacts: {count}")
+    print(f"{'Before (dict-based objects)':<30} | {legacy:.0f} bytes per contact")
+    print(f"{'After (slots + array phones)':<30} | {compact:.0f} bytes per contact")
+    print(f"Saved: {100 * (1 - compact / legacy):.0f}%")
@@ -0,0 +1,116 @@
+"""
+Мережевий режим бота: asyncio TCP-сервер, що обслуговує одну адресну книгу для багатьох клієнтів.
+
+Протокол рядковий, команди ті самі, що й у main() з hw1 (add, phone, change, birthdays, ...).
+На кожен рядок сервер відповідає рядком з кількістю рядків відповіді, за яким ідуть самі рядки:
+
+    phone John          ->  1
+                            John's phones: 1234567890
+
+Клієнт може надсилати команди, не чекаючи відповідей (конвеєр): відповіді повертаються в тому ж порядку.
+Усі команди виконуються в циклі подій без await, тож записи не перетинаються між собою й з читаннями.
+Клієнт, що змінив книгу, отримує відповідь лише після запису журналу на диск; один flush журналу
+обслуговує всі записи, зроблені за одну ітерацію циклу подій.
+"""
+import argparse
+import asyncio
+import signal
+
+from hw1 import commands, load_data, parse_input, save_data
+
+WRITE_COMMANDS = {"add", "change", "delete", "add-birthday"}  # Команди, що змінюють книгу
+QUIT_COMMANDS = {"close", "exit"}  # Закривають лише з'єднання, а не сервер
+HIGH_WATER = 64 * 1024  # Розмір буфера відповідей, після якого сервер чекає на клієнта
+
+def frame(reply):
+    """Кодує відповідь: кількість рядків, потім самі рядки."""
+    lines = [] if reply is None else reply.split("\n")
+    return (f"{len(lines)}\n" + "".join(line + "\n" for line in lines)).encode("utf-8")
+
+class BookServer:
+    """Обробляє з'єднання клієнтів над однією адресною книгою."""
+    def __init__(self, book):
+        self.book = book
+        self.committed = None  # Future, що завершується після наступного flush журналу
+
+    async def execute(self, command, args):
+        """Виконує одну команду; відповідь на запис повертається після запису журналу."""
+        reply = commands.dispatch(command, args, self.book)[0]
+        if command not in WRITE_COMMANDS:
+            return reply
+        journal = self.book.journal
+        if journal.needs_compaction(len(self.book)):
+            journal.compact(self.book)
+        if self.committed is None:
+            self.committed = asyncio.get_running_loop().create_future()
+            asyncio.get_running_loop().call_soon(self.flush)
+        await self.committed
+        return reply
+
+    def flush(self):
+        """Записує журнал один раз для всіх змін, що чекають на підтвердження."""
+        committed, self.committed = self.committed, None
+        self.book.journal.flush()
+        committed.set_result(None)
+
+    async def handle(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                command, args = parse_input(line.decode("utf-8", "replace"))
+                if command in QUIT_COMMANDS:
+                    writer.write(frame("Good bye!"))
+                    break
+                try:
+                    reply = await self.execute(command, args) if command else None
+                except Exception as error:
+                    reply = f"Error: {error!r}"  # Несподівана помилка обробника не закриває з'єднання
+                writer.write(frame(reply))
+                if writer.transport.get_write_buffer_size() > HIGH_WATER:
+                    await writer.drain()
+            await writer.drain()
+        except (ConnectionError, ValueError):
+            pass  # Клієнт від'єднався або надіслав занадто довгий рядок
+        finally:
+            writer.close()
+
+def raise_open_files_limit():
+    """Тисячам з'єднань потрібно більше відкритих файлів, ніж дозволяє стандартний м'який ліміт."""
+    try:
+        import resource
+    except ImportError:
+        return  # Windows
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+async def serve(host="127.0.0.1", port=8765, filename="addressbook.pkl"):
+    """Запускає сервер і зберігає книгу через save_data під час зупинки."""
+    book = load_data(filename)
+    book.journal.buffered = True  # Журнал скидається на диск після кожного запису самим сервером
+    server = BookServer(book)
+    listener = await asyncio.start_server(server.handle, host, port, backlog=4096)
+    task = asyncio.current_task()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+    except (NotImplementedError, AttributeError):
+        pass  # Windows не підтримує обробники сигналів у циклі подій
+    print(f"Serving {filename} on {host}:{port}", flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        save_data(book, filename)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TCP-сервер адресної книги.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--file", default="addressbook.pkl", help="файл адресної книги")
+    options = parser.parse_args()
+    raise_open_files_limit()
+    try:
+        asyncio.run(serve(options.host, options.port, options.file))
+    except KeyboardInterrupt:
+        pass